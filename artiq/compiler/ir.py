@@ -340,23 +340,52 @@ class Terminator(Instruction):
     def successors(self):
         return [operand for operand in self.operands if isinstance(operand, BasicBlock)]
 
+# Instruction classes are numbered as they are first placed in a basic block.
+_opcode_numbers = {}
+# Translation tables from opcode numbers to 1 for the numbers of subclasses
+# of a tuple of classes, and to 0 otherwise.
+_opcode_masks = {}
+
+def _opcode_number(insn):
+    cls = type(insn)
+    number = _opcode_numbers.get(cls)
+    if number is None:
+        number = _opcode_numbers[cls] = len(_opcode_numbers)
+        assert number < 256
+    return number
+
+def _opcode_mask(classes):
+    key = (classes, len(_opcode_numbers))
+    mask = _opcode_masks.get(key)
+    if mask is None:
+        mask = bytearray(256)
+        for cls, number in _opcode_numbers.items():
+            if issubclass(cls, classes):
+                mask[number] = 1
+        mask = _opcode_masks[key] = bytes(mask)
+    return mask
+
 class BasicBlock(NamedValue):
     """
     A block of instructions with no control flow inside it.
 
     :ivar instructions: (list of :class:`Instruction`)
+    :ivar opcodes: (bytearray) opcode number of each instruction,
+        kept in step with ``instructions``
     """
     _dump_loc = True
 
     def __init__(self, instructions, name=""):
         super().__init__(TBasicBlock(), name)
         self.instructions = []
+        self.opcodes = bytearray()
         self.set_instructions(instructions)
 
     def set_instructions(self, new_insns):
         for insn in self.instructions:
             insn.detach()
         self.instructions = new_insns
+        self.opcodes = bytearray(map(_opcode_number, new_insns))
         for insn in self.instructions:
             insn.set_basic_block(self)
 
@@ -377,29 +406,57 @@ class BasicBlock(NamedValue):
         assert isinstance(insn, Instruction)
         insn.set_basic_block(self)
         self.instructions.insert(0, insn)
+        self.opcodes.insert(0, _opcode_number(insn))
         return insn
 
     def append(self, insn):
         assert isinstance(insn, Instruction)
         insn.set_basic_block(self)
         self.instructions.append(insn)
+        self.opcodes.append(_opcode_number(insn))
         return insn
 
+    def extend(self, insns):
+        insns = list(insns)
+        for insn in insns:
+            assert isinstance(insn, Instruction)
+            insn.set_basic_block(self)
+        self.instructions.extend(insns)
+        self.opcodes.extend(map(_opcode_number, insns))
+        return insns
+
     def index(self, insn):
         return self.instructions.index(insn)
 
     def insert(self, insn, before):
         assert isinstance(insn, Instruction)
         insn.set_basic_block(self)
-        self.instructions.insert(self.index(before), insn)
+        index = self.index(before)
+        self.instructions.insert(index, insn)
+        self.opcodes.insert(index, _opcode_number(insn))
         return insn
 
     def remove(self, insn):
         assert insn in self.instructions
         insn._detach()
-        self.instructions.remove(insn)
+        index = self.index(insn)
+        del self.instructions[index]
+        del self.opcodes[index]
         return insn
 
+    def instructions_of(self, *classes):
+        """
+        Returns the instructions that are instances of any of ``classes``,
+        in order. Only the opcode numbers are scanned.
+        """
+        matches = self.opcodes.translate(_opcode_mask(classes))
+        instructions = []
+        index = matches.find(1)
+        while index != -1:
+            instructions.append(self.instructions[index])
+            index = matches.find(1, index + 1)
+        return instructions
+
     def replace(self, insn, replacement):
         self.insert(replacement, before=insn)
         self.remove(insn)
@@ -533,6 +590,10 @@ class Function:
         for basic_block in self.basic_blocks:
             yield from iter(basic_block.instructions)
 
+    def instructions_of(self, *classes):
+        for basic_block in self.basic_blocks:
+            yield from iter(basic_block.instructions_of(*classes))
+
     def as_entity(self, type_printer):
         postorder = []
         visited   = set()
@@ -624,6 +685,9 @@ class Alloc(Instruction):
     """
     An instruction that allocates an object specified by
     the type of the intsruction.
+
+    Lists are allocated with their length as the first operand, optionally
+    followed by the initial values of all of their elements.
     """
 
     def __init__(self, operands, typ, name=""):
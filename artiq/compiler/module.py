@@ -61,6 +61,7 @@ class Module:
                                                          embedding_map=self.embedding_map)
         dead_code_eliminator = transforms.DeadCodeEliminator(engine=self.engine)
         local_access_validator = validators.LocalAccessValidator(engine=self.engine)
+        cfg_simplifier = transforms.CFGSimplifier()
         local_demoter = transforms.LocalDemoter()
         constant_hoister = transforms.ConstantHoister()
         devirtualization = analyses.Devirtualization()
@@ -81,6 +82,8 @@ class Module:
         interleaver.process(self.artiq_ir)
         local_access_validator.process(self.artiq_ir)
         local_demoter.process(self.artiq_ir)
+        cfg_simplifier.process(self.artiq_ir)
+        dead_code_eliminator.process(self.artiq_ir)
         constant_hoister.process(self.artiq_ir)
         if remarks:
             invariant_detection.process(self.artiq_ir)
@@ -5,6 +5,7 @@ from .cast_monomorphizer import CastMonomorphizer
 from .iodelay_estimator import IODelayEstimator
 from .artiq_ir_generator import ARTIQIRGenerator
 from .dead_code_eliminator import DeadCodeEliminator
+from .cfg_simplifier import CFGSimplifier
 from .local_demoter import LocalDemoter
 from .constant_hoister import ConstantHoister
 from .interleaver import Interleaver
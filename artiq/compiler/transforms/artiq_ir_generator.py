@@ -18,11 +18,41 @@ def _readable_name(insn):
     else:
         return insn.name
 
-def _extract_loc(node):
-    if "keyword_loc" in node._locs:
-        return node.keyword_loc
+def _is_bitwise_comparable(typ):
+    # Floats compare differently from their bit patterns (NaN, signed zeroes),
+    # and the padding bits of a stored bool are unspecified.
+    return builtins.is_int(typ)
+
+def _loc_attr(node_type):
+    if "keyword_loc" in node_type._locs:
+        return "keyword_loc"
     else:
-        return node.loc
+        return "loc"
+
+# Operator tags for synthesized arithmetic and comparisons. They carry
+# no location and are never mutated, so a single instance of each is shared
+# by every instruction instead of allocating a new AST node per instruction.
+_ADD      = ast.Add(loc=None)
+_SUB      = ast.Sub(loc=None)
+_MULT     = ast.Mult(loc=None)
+_DIV      = ast.Div(loc=None)
+_FLOORDIV = ast.FloorDiv(loc=None)
+_MOD      = ast.Mod(loc=None)
+_BITAND   = ast.BitAnd(loc=None)
+_BITXOR   = ast.BitXor(loc=None)
+_EQ       = ast.Eq(loc=None)
+_NOTEQ    = ast.NotEq(loc=None)
+_LT       = ast.Lt(loc=None)
+_LTE      = ast.LtE(loc=None)
+_GT       = ast.Gt(loc=None)
+_GTE      = ast.GtE(loc=None)
+
+# Tuples of up to this many scalars are compared without branching.
+_MAX_STRAIGHT_TUPLE_COMPARE = 4
+
+# Types are only inspected once IR generation starts, so one instance
+# of the types used for synthesized values is likewise shared.
+_T_BOOL   = builtins.TBool()
 
 # We put some effort in keeping generated IR readable,
 # i.e. with a more or less linear correspondence to the source.
@@ -39,6 +69,9 @@ class ARTIQIRGenerator(algorithm.Visitor):
         module, def or lambda currently being translated
     :ivar current_globals: (set of string)
         set of variables that will be resolved in global scope
+    :ivar current_globalenv: (:class:`ir.Builtin` or None)
+        the global environment of the current function, once one of
+        its variables resolved in global scope has been accessed
     :ivar current_block: (:class:`ir.BasicBlock`)
         basic block to which any new instruction will be appended
     :ivar current_env: (:class:`ir.Alloc` of type :class:`ir.TEnvironment`)
@@ -88,12 +121,34 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
     :ivar array_op_funcs: the map from mangled name to implementation of
         operations on/between arrays
+
+    Synthesized constants and private environment types are interned as well:
+
+    :ivar constant_map: (map of (value, :class:`types.Type`) to :class:`ir.Constant`)
+        the map from constant values to the shared :class:`ir.Constant`
+        instances returned by :meth:`_const`
+    :ivar private_env_type_map: (map of :class:`types.Type` to :class:`ir.TEnvironment`)
+        the map from return types to the shared type of private
+        environments of functions returning them
+
+    Visitor dispatch is resolved once per AST node type:
+
+    :ivar visitor_map: (map of AST node type to (bound method, string))
+        the map from node types to their visitor method and the name
+        of the attribute holding their location
+
+    :ivar debug: (bool) whether to give basic blocks and instructions
+        readable names; on by default, off when running with ``-O``
     """
 
     _size_type = builtins.TInt32()
 
+    # The continuation state of every ``finally`` clause has the same layout.
+    _final_env_type = ir.TEnvironment(name="try.final", vars={ "$cont": ir.TBasicBlock() })
+
     def __init__(self, module_name, engine, ref_period, embedding_map):
         self.engine = engine
+        self.debug = __debug__
         self.embedding_map = embedding_map
         self.functions = []
         self.name = [module_name] if module_name != "" else []
@@ -102,6 +157,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         self.current_function = None
         self.current_class = None
         self.current_globals = set()
+        self.current_globalenv = None
         self.current_block = None
         self.current_env = None
         self.current_private_env = None
@@ -120,6 +176,9 @@ class ARTIQIRGenerator(algorithm.Visitor):
         self.method_map = defaultdict(lambda: [])
         self.array_op_funcs = dict()
         self.raise_assert_func = None
+        self.constant_map = dict()
+        self.private_env_type_map = dict()
+        self.visitor_map = dict()
 
     def annotate_calls(self, devirtualization):
         for var_node in devirtualization.variable_map:
@@ -144,7 +203,36 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 assert isinstance(call, (ir.Call, ir.Invoke))
                 call.static_target_function = callee
 
+    def _const(self, value, typ):
+        # Constants are immutable value nodes, so the same instance can be
+        # an operand of any number of instructions. The Python type of the value
+        # is a part of the key to keep e.g. 0, 0.0 and False apart.
+        key = (type(value), value, typ.find())
+        const = self.constant_map.get(key)
+        if const is None:
+            const = self.constant_map[key] = ir.Constant(value, typ)
+        return const
+
+    def _private_env_type(self, name, ret):
+        # Private environments only ever hold the return value, so functions
+        # with the same return type can share one environment type. It keeps
+        # the name of the first function that needed it.
+        ret = ret.find()
+        env_type = self.private_env_type_map.get(ret)
+        if env_type is None:
+            env_type = self.private_env_type_map[ret] = \
+                ir.TEnvironment(name=name, vars={ "$return": ret })
+        return env_type
+
+    def _name(self, fmt, *args):
+        if self.debug:
+            return fmt.format(*args)
+        else:
+            return ""
+
     def add_block(self, name=""):
+        if not self.debug:
+            name = ""
         block = ir.BasicBlock([], name)
         self.current_function.add(block)
         return block
@@ -159,6 +247,18 @@ class ARTIQIRGenerator(algorithm.Visitor):
             insn.loc = loc
         return block.append(insn)
 
+    def extend(self, insns, block=None, loc=None):
+        if loc is None:
+            loc = self.current_loc
+        if block is None:
+            block = self.current_block
+
+        insns = list(insns)
+        for insn in insns:
+            if insn.loc is None:
+                insn.loc = loc
+        return block.extend(insns)
+
     def terminate(self, insn):
         if not self.current_block.is_terminated():
             self.append(insn)
@@ -181,9 +281,17 @@ class ARTIQIRGenerator(algorithm.Visitor):
                     break
                 self.visit(elt)
         elif isinstance(obj, ast.AST):
+            node_type = type(obj)
+            try:
+                visitor, loc_attr = self.visitor_map[node_type]
+            except KeyError:
+                visitor  = getattr(self, "visit_" + node_type.__name__, self.generic_visit)
+                loc_attr = _loc_attr(node_type)
+                self.visitor_map[node_type] = visitor, loc_attr
+
             try:
-                old_loc, self.current_loc = self.current_loc, _extract_loc(obj)
-                return self._visit_one(obj)
+                old_loc, self.current_loc = self.current_loc, getattr(obj, loc_attr)
+                return visitor(obj)
             finally:
                 self.current_loc = old_loc
 
@@ -207,13 +315,14 @@ class ARTIQIRGenerator(algorithm.Visitor):
             env = self.append(ir.Alloc([], env_type, name="env"))
             old_env, self.current_env = self.current_env, env
 
-            priv_env_type = ir.TEnvironment(name=func.name + ".priv", vars={ "$return": typ.ret })
+            priv_env_type = self._private_env_type(func.name + ".priv", typ.ret)
             priv_env = self.append(ir.Alloc([], priv_env_type, name="privenv"))
             old_priv_env, self.current_private_env = self.current_private_env, priv_env
 
             self.generic_visit(node)
-            self.terminate(ir.Return(ir.Constant(None, builtins.TNone()),
-                           remote_return=self.current_remote_fn))
+            if not self.current_block.is_terminated():
+                self.append(ir.Return(self._const(None, builtins.TNone()),
+                                      remote_return=self.current_remote_fn))
 
             return self.functions
         finally:
@@ -249,6 +358,14 @@ class ARTIQIRGenerator(algorithm.Visitor):
             if not is_quoted:
                 for arg_name, default_node in zip(typ.optargs, node.args.defaults):
                     default = self.visit(default_node)
+                    if isinstance(default, ir.Constant):
+                        # Constants can be used directly in the function body, so
+                        # there is no need to pass them through the environment.
+                        def codegen_default(default):
+                            return lambda: default
+                        defaults.append(codegen_default(default))
+                        continue
+
                     env_default_name = \
                         self.current_env.type.add("$default." + arg_name, default.type)
                     self.append(ir.SetLocal(self.current_env, env_default_name, default))
@@ -268,14 +385,14 @@ class ARTIQIRGenerator(algorithm.Visitor):
             old_args, self.current_args = self.current_args, {}
 
             args = []
-            for arg_name in typ.args:
-                arg = ir.Argument(typ.args[arg_name], "ARG." + arg_name)
+            for arg_name, arg_type in typ.args.items():
+                arg = ir.Argument(arg_type, "ARG." + arg_name)
                 self.current_args[arg_name] = arg
                 args.append(arg)
 
             optargs = []
-            for arg_name in typ.optargs:
-                arg = ir.Argument(ir.TOption(typ.optargs[arg_name]), "ARG." + arg_name)
+            for arg_name, arg_type in typ.optargs.items():
+                arg = ir.Argument(ir.TOption(arg_type), "ARG." + arg_name)
                 self.current_args[arg_name] = arg
                 optargs.append(arg)
 
@@ -295,42 +412,51 @@ class ARTIQIRGenerator(algorithm.Visitor):
             entry = self.add_block("entry")
             old_block, self.current_block = self.current_block, entry
 
-            old_globals, self.current_globals = self.current_globals, node.globals_in_scope
+            globals_in_scope = node.globals_in_scope
+            if not isinstance(globals_in_scope, set):
+                globals_in_scope = set(globals_in_scope)
+            old_globals, self.current_globals = self.current_globals, globals_in_scope
             old_remote_fn = self.current_remote_fn
             self.current_remote_fn = getattr(node, "remote_fn", False)
 
             env_without_globals = \
-                {var: node.typing_env[var]
-                 for var in node.typing_env
-                  if var not in node.globals_in_scope}
+                {var: var_type
+                 for var, var_type in node.typing_env.items()
+                  if var not in globals_in_scope}
             env_type = ir.TEnvironment(name=func.name,
                                        vars=env_without_globals, outer=self.current_env.type)
             env = self.append(ir.Alloc([], env_type, name="ENV"))
             old_env, self.current_env = self.current_env, env
 
             if not is_lambda:
-                priv_env_type = ir.TEnvironment(name="{}.private".format(func.name),
-                                                vars={ "$return": typ.ret })
+                priv_env_type = self._private_env_type("{}.private".format(func.name),
+                                                       typ.ret)
                 priv_env = self.append(ir.Alloc([], priv_env_type, name="PRV"))
                 old_priv_env, self.current_private_env = self.current_private_env, priv_env
 
             self.append(ir.SetLocal(env, "$outer", env_arg))
-            for index, arg_name in enumerate(typ.args):
-                self.append(ir.SetLocal(env, arg_name, args[index]))
-            for index, (arg_name, codegen_default) in enumerate(zip(typ.optargs, defaults)):
+
+            # Looked up on first access; see _env_for.
+            old_globalenv, self.current_globalenv = self.current_globalenv, None
+
+            for arg_name, arg in zip(typ.args, args):
+                self.append(ir.SetLocal(env, arg_name, arg))
+            for (arg_name, arg_type), optarg, codegen_default in \
+                    zip(typ.optargs.items(), optargs, defaults):
                 default = codegen_default()
-                value = self.append(ir.Builtin("unwrap_or", [optargs[index], default],
-                                               typ.optargs[arg_name],
+                value = self.append(ir.Builtin("unwrap_or", [optarg, default],
+                                               arg_type,
                                                name="DEF.{}".format(arg_name)))
                 self.append(ir.SetLocal(env, arg_name, value))
 
             result = self.visit(node.body)
 
             if is_lambda:
-                self.terminate(ir.Return(result))
+                if not self.current_block.is_terminated():
+                    self.append(ir.Return(result))
             elif builtins.is_none(typ.ret):
                 if not self.current_block.is_terminated():
-                    self.current_block.append(ir.Return(ir.Constant(None, builtins.TNone()), 
+                    self.current_block.append(ir.Return(self._const(None, builtins.TNone()), 
                                                         remote_return=self.current_remote_fn))
             else:
                 if not self.current_block.is_terminated():
@@ -349,6 +475,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
             self.current_function = old_func
             self.current_block = old_block
             self.current_globals = old_globals
+            self.current_globalenv = old_globalenv
             self.current_env = old_env
             self.current_remote_fn = old_remote_fn
             if not is_lambda:
@@ -368,7 +495,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
     def visit_Return(self, node):
         if node.value is None:
-            return_value = ir.Constant(None, builtins.TNone())
+            return_value = self._const(None, builtins.TNone())
         else:
             return_value = self.visit(node.value)
 
@@ -423,17 +550,17 @@ class ARTIQIRGenerator(algorithm.Visitor):
         if builtins.is_bool(insn.type):
             return insn
         elif builtins.is_int(insn.type):
-            return self.append(ir.Compare(ast.NotEq(loc=None), insn, ir.Constant(0, insn.type)),
+            return self.append(ir.Compare(_NOTEQ, insn, self._const(0, insn.type)),
                                block=block)
         elif builtins.is_float(insn.type):
-            return self.append(ir.Compare(ast.NotEq(loc=None), insn, ir.Constant(0, insn.type)),
+            return self.append(ir.Compare(_NOTEQ, insn, self._const(0, insn.type)),
                                block=block)
         elif builtins.is_iterable(insn.type):
             length = self.iterable_len(insn)
-            return self.append(ir.Compare(ast.NotEq(loc=None), length, ir.Constant(0, length.type)),
+            return self.append(ir.Compare(_NOTEQ, length, self._const(0, length.type)),
                                block=block)
         elif builtins.is_none(insn.type):
-            return ir.Constant(False, builtins.TBool())
+            return self._const(False, _T_BOOL)
         else:
             note = diagnostic.Diagnostic("note",
                 "this expression has type {type}",
@@ -443,9 +570,11 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 "this expression, which is always truthful, is coerced to bool", {},
                 insn.loc, notes=[note])
             self.engine.process(diag)
-            return ir.Constant(True, builtins.TBool())
+            return self._const(True, _T_BOOL)
 
     def visit_If(self, node):
+        has_else = bool(node.orelse)
+
         cond = self.visit(node.test)
         cond = self.coerce_to_bool(cond)
         head = self.current_block
@@ -455,7 +584,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         self.visit(node.body)
         post_if_true = self.current_block
 
-        if any(node.orelse):
+        if has_else:
             if_false = self.add_block("if.else")
             self.current_block = if_false
             self.visit(node.orelse)
@@ -466,7 +595,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         if not post_if_true.is_terminated():
             post_if_true.append(ir.Branch(tail))
 
-        if any(node.orelse):
+        if has_else:
             if not post_if_false.is_terminated():
                 post_if_false.append(ir.Branch(tail))
             self.append(ir.BranchIf(cond, if_true, if_false), block=head)
@@ -474,6 +603,8 @@ class ARTIQIRGenerator(algorithm.Visitor):
             self.append(ir.BranchIf(cond, if_true, tail), block=head)
 
     def visit_While(self, node):
+        has_else = bool(node.orelse)
+
         try:
             head = self.add_block("while.head")
             self.append(ir.Branch(head))
@@ -494,7 +625,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
             self.break_target = old_break
             self.continue_target = old_continue
 
-        if any(node.orelse):
+        if has_else:
             else_tail = self.add_block("while.else")
             self.current_block = else_tail
             self.visit(node.orelse)
@@ -503,7 +634,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         tail = self.add_block("while.tail")
         self.current_block = tail
 
-        if any(node.orelse):
+        if has_else:
             if not post_else_tail.is_terminated():
                 post_else_tail.append(ir.Branch(tail))
         else:
@@ -514,22 +645,46 @@ class ARTIQIRGenerator(algorithm.Visitor):
             post_body.append(ir.Branch(head))
         break_block.append(ir.Branch(tail))
 
+    def _constant_range_bounds(self, value):
+        # Ranges are immutable, so the bounds of a range constructed from
+        # constants in the current function are known at compile time.
+        if isinstance(value, ir.Alloc) and \
+                all(isinstance(operand, ir.Constant) for operand in value.operands):
+            return [operand.value for operand in value.operands]
+
     def iterable_len(self, value, typ=_size_type):
         if builtins.is_listish(value.type):
+            if builtins.is_list(value.type) and isinstance(value, ir.Alloc) and \
+                    isinstance(value.operands[0], ir.Constant):
+                # Lists cannot be resized, so the length they were allocated
+                # with is their length.
+                return self._const(value.operands[0].value, typ)
+
             if isinstance(value, ir.Constant):
                 name = None
             else:
-                name = "{}.len".format(value.name)
-            len = self.append(ir.Builtin("len", [value], builtins.TInt32(),
+                name = self._name("{}.len", value.name)
+            len = self.append(ir.Builtin("len", [value], self._size_type,
                                          name=name))
             return self.append(ir.Coerce(len, typ))
         elif builtins.is_range(value.type):
+            bounds = self._constant_range_bounds(value)
+            if bounds is not None and bounds[2] != 0:
+                start, stop, step = bounds
+                # Fold with the truncating semantics of the integer division
+                # the backend emits for the general case below.
+                spread = stop - start
+                length = abs(spread) // abs(step)
+                if (spread < 0) != (step < 0):
+                    length = -length
+                return self._const(length, value.operands[1].type)
+
             start  = self.append(ir.GetAttr(value, "start"))
             stop   = self.append(ir.GetAttr(value, "stop"))
             step   = self.append(ir.GetAttr(value, "step"))
-            spread = self.append(ir.Arith(ast.Sub(loc=None), stop, start))
-            return self.append(ir.Arith(ast.FloorDiv(loc=None), spread, step,
-                                        name="{}.len".format(value.name)))
+            spread = self.append(ir.Arith(_SUB, stop, start))
+            return self.append(ir.Arith(_FLOORDIV, spread, step,
+                                        name=self._name("{}.len", value.name)))
         else:
             assert False
 
@@ -540,13 +695,13 @@ class ARTIQIRGenerator(algorithm.Visitor):
             num_dims = value.type.find()["num_dims"].value
             if num_dims > 1:
                 old_shape = self.append(ir.GetAttr(value, "shape"))
-                lengths = [self.append(ir.GetAttr(old_shape, i)) for i in range(1, num_dims)]
+                lengths = self.extend([ir.GetAttr(old_shape, i) for i in range(1, num_dims)])
                 new_shape = self._make_array_shape(lengths)
 
                 stride = reduce(
-                    lambda l, r: self.append(ir.Arith(ast.Mult(loc=None), l, r)),
+                    lambda l, r: self.append(ir.Arith(_MULT, l, r)),
                     lengths[1:], lengths[0])
-                offset = self.append(ir.Arith(ast.Mult(loc=None), stride, index))
+                offset = self.append(ir.Arith(_MULT, stride, index))
                 old_buffer = self.append(ir.GetAttr(value, "buffer"))
                 new_buffer = self.append(ir.Offset(old_buffer, offset))
 
@@ -559,25 +714,71 @@ class ARTIQIRGenerator(algorithm.Visitor):
         elif builtins.is_listish(value.type):
             return self.append(ir.GetElem(value, index))
         elif builtins.is_range(value.type):
+            bounds = self._constant_range_bounds(value)
+            if bounds is not None:
+                start, _, step = value.operands
+                if bounds[2] == 1:
+                    offset = index
+                else:
+                    offset = self.append(ir.Arith(_MULT, step, index))
+                if bounds[0] == 0:
+                    return offset
+                return self.append(ir.Arith(_ADD, start, offset))
+
             start  = self.append(ir.GetAttr(value, "start"))
             step   = self.append(ir.GetAttr(value, "step"))
-            offset = self.append(ir.Arith(ast.Mult(loc=None), step, index))
-            return self.append(ir.Arith(ast.Add(loc=None), start, offset))
+            offset = self.append(ir.Arith(_MULT, step, index))
+            return self.append(ir.Arith(_ADD, start, offset))
         else:
             assert False
 
+    def copy_list_range(self, dest, dest_index, src, src_index, count):
+        # Elements of type None occupy no memory, so there is nothing to copy.
+        if builtins.is_none(builtins.get_iterable_elt(dest.type)):
+            return
+        self.append(ir.Builtin("list_copy_range", [dest, dest_index, src, src_index, count],
+                               builtins.TNone()))
+
     def visit_ForT(self, node):
+        has_else = bool(node.orelse)
+
         try:
             iterable = self.visit(node.iter)
-            length = self.iterable_len(iterable)
+
+            # A range with constant bounds can be iterated over without computing
+            # its elements, with the induction variable taking its values directly.
+            # It runs until the value after the last element, so that the loop runs
+            # exactly as many times as the length of the range, and never steps past
+            # the stop bound. Loops with a trip count need an induction variable that
+            # counts from zero instead.
+            is_direct = False
+            if builtins.is_range(iterable.type) and node.trip_count is None:
+                bounds = self._constant_range_bounds(iterable)
+                is_direct = bounds is not None and bounds[2] != 0
+
+            if is_direct:
+                start, _, step = iterable.operands
+                length = self.iterable_len(iterable)
+                stop = self._const(start.value + length.value * step.value, start.type)
+                iterable.erase()
+                init = start
+            else:
+                length = self.iterable_len(iterable)
+                init, step = self._const(0, length.type), self._const(1, length.type)
+
             prehead = self.current_block
+            append = self.append
 
             head = self.add_block("for.head")
-            self.append(ir.Branch(head))
+            append(ir.Branch(head))
             self.current_block = head
-            phi = self.append(ir.Phi(length.type, name="IND"))
-            phi.add_incoming(ir.Constant(0, phi.type), prehead)
-            cond = self.append(ir.Compare(ast.Lt(loc=None), phi, length, name="CMP"))
+            phi = append(ir.Phi(init.type, name="IND"))
+            phi.add_incoming(init, prehead)
+            if is_direct:
+                cond = append(ir.Compare(_LT if step.value > 0 else _GT, phi, stop,
+                                         name="CMP"))
+            else:
+                cond = append(ir.Compare(_LT, phi, length, name="CMP"))
 
             break_block = self.add_block("for.break")
             old_break, self.break_target = self.break_target, break_block
@@ -586,14 +787,16 @@ class ARTIQIRGenerator(algorithm.Visitor):
             old_continue, self.continue_target = self.continue_target, continue_block
             self.current_block = continue_block
 
-            updated_index = self.append(ir.Arith(ast.Add(loc=None), phi, ir.Constant(1, phi.type),
-                                                 name="IND.new"))
+            updated_index = append(ir.Arith(_ADD, phi, step, name="IND.new"))
             phi.add_incoming(updated_index, continue_block)
-            self.append(ir.Branch(head))
+            append(ir.Branch(head))
 
             body = self.add_block("for.body")
             self.current_block = body
-            elt = self.iterable_get(iterable, phi)
+            if is_direct:
+                elt = phi
+            else:
+                elt = self.iterable_get(iterable, phi)
             try:
                 self.current_assign = elt
                 self.visit(node.target)
@@ -605,7 +808,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
             self.break_target = old_break
             self.continue_target = old_continue
 
-        if any(node.orelse):
+        if has_else:
             else_tail = self.add_block("for.else")
             self.current_block = else_tail
             self.visit(node.orelse)
@@ -614,7 +817,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         tail = self.add_block("for.tail")
         self.current_block = tail
 
-        if any(node.orelse):
+        if has_else:
             if not post_else_tail.is_terminated():
                 post_else_tail.append(ir.Branch(tail))
         else:
@@ -674,17 +877,17 @@ class ARTIQIRGenerator(algorithm.Visitor):
             self.raise_exn(lambda: self.visit(node.exc), loc=self.current_loc)
 
     def visit_Try(self, node):
+        has_else = bool(node.orelse)
+        has_final = bool(node.finalbody)
+
         dispatcher = self.add_block("try.dispatch")
         cleanup = self.add_block('handler.cleanup')
         landingpad = ir.LandingPad(cleanup)
         dispatcher.append(landingpad)
 
-        if any(node.finalbody):
+        if has_final:
             # k for continuation
-            final_suffix   = ".try@{}:{}".format(node.loc.line(), node.loc.column())
-            final_env_type = ir.TEnvironment(name=self.current_function.name + final_suffix,
-                                             vars={ "$cont": ir.TBasicBlock() })
-            final_state    = self.append(ir.Alloc([], final_env_type))
+            final_state    = self.append(ir.Alloc([], self._final_env_type))
             final_targets  = []
             final_paths    = []
 
@@ -729,7 +932,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
             exn_type = handler_node.name_type.find()
             if handler_node.filter is not None and \
                     not builtins.is_exception(exn_type, 'Exception'):
-                handler = self.add_block("handler." + exn_type.name)
+                handler = self.add_block(self._name("handler.{}", exn_type.name))
                 phi = ir.Phi(builtins.TException(), 'exn')
                 handler.append(phi)
                 clauses.append((handler, exn_type, phi))
@@ -760,11 +963,11 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
         if not self.current_block.is_terminated():
             self.visit(node.orelse)
-        elif any(node.orelse):
+        elif has_else:
             self.warn_unreachable(node.orelse[0])
         body = self.current_block
 
-        if any(node.finalbody):
+        if has_final:
             # if we have a final block, we should not append clauses to our
             # landingpad or we will skip the finally block.
             # when the finally block calls resume, it will unwind to the outer
@@ -777,7 +980,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 self.continue_target = old_continue
             self.return_target = old_return
 
-        if any(node.finalbody):
+        if has_final:
             # create new unwind target for cleanup
             final_dispatcher = self.add_block("try.final.dispatch")
             final_landingpad = ir.LandingPad(cleanup)
@@ -786,7 +989,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
             # make sure that exception clauses are unwinded to the finally block
             old_unwind, self.unwind_target = self.unwind_target, final_dispatcher
 
-        if any(node.finalbody):
+        if has_final:
             # if we have a while:try/finally continue must execute finally
             # before continuing the while
             redirect = final_branch
@@ -848,7 +1051,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
             self.continue_target = old_continue
         self.return_target = old_return
 
-        if any(node.finalbody):
+        if has_final:
             # Finalize and continue after try statement.
             self.unwind_target = old_unwind
             # Exception path
@@ -910,7 +1113,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
                     handler.append(ir.Branch(tail))
 
     def _try_finally(self, body_gen, finally_gen, name):
-        dispatcher = self.add_block("{}.dispatch".format(name))
+        dispatcher = self.add_block(self._name("{}.dispatch", name))
 
         try:
             old_unwind, self.unwind_target = self.unwind_target, dispatcher
@@ -923,7 +1126,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
         self.post_body = self.current_block
 
-        self.current_block = self.add_block("{}.cleanup".format(name))
+        self.current_block = self.add_block(self._name("{}.cleanup", name))
         dispatcher.append(ir.LandingPad(self.current_block))
         finally_gen()
         self.terminate(ir.Resume(self.unwind_target))
@@ -972,7 +1175,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 self.visit(stmt)
 
                 mid_mu = self.append(ir.Builtin("now_mu", [], builtins.TInt64()))
-                gt_mu  = self.append(ir.Compare(ast.Gt(loc=None), mid_mu, end_mu))
+                gt_mu  = self.append(ir.Compare(_GT, mid_mu, end_mu))
                 end_mu = self.append(ir.Select(gt_mu, mid_mu, end_mu))
 
             self.append(ir.Builtin("at_mu", [end_mu], builtins.TNone()))
@@ -1049,8 +1252,17 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
     def _env_for(self, name):
         if name in self.current_globals:
-            return self.append(ir.Builtin("globalenv", [self.current_env],
-                                          self.current_env.type.outermost()))
+            if self.current_globalenv is None:
+                # The global environment doesn't change within a function, so look it
+                # up once in the entry block, right after the function environment
+                # is allocated, where it dominates every access.
+                entry = self.current_function.entry()
+                env = entry.instructions[0]
+                assert isinstance(env, ir.Alloc) and ir.is_environment(env.type)
+                globalenv = ir.Builtin("globalenv", [env], env.type.outermost())
+                globalenv.loc = env.loc
+                self.current_globalenv = entry.insert(globalenv, before=entry.instructions[1])
+            return self.current_globalenv
         else:
             return self.current_env
 
@@ -1087,7 +1299,8 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
         if self.current_assign is None:
             return self.append(ir.GetAttr(obj, node.attr,
-                                          name="{}.FLD.{}".format(_readable_name(obj), node.attr)))
+                                          name=self._name("{}.FLD.{}", _readable_name(obj),
+                                                          node.attr)))
         else:
             return self.append(ir.SetAttr(obj, node.attr, self.current_assign))
 
@@ -1146,23 +1359,31 @@ class ARTIQIRGenerator(algorithm.Visitor):
         if self.unwind_target is None:
             insn = self.append(ir.Call(closure, params, {}))
         else:
-            after_invoke = self.add_block(block_name + ".invoke")
+            after_invoke = self.add_block(self._name("{}.invoke", block_name))
             insn = self.append(ir.Invoke(closure, params, {}, after_invoke, self.unwind_target))
             self.current_block = after_invoke
         insn.is_cold = True
         self.append(ir.Unreachable())
 
     def _map_index(self, length, index, one_past_the_end=False, loc=None):
-        lt_0          = self.append(ir.Compare(ast.Lt(loc=None),
-                                               index, ir.Constant(0, index.type)))
-        from_end      = self.append(ir.Arith(ast.Add(loc=None), length, index))
-        mapped_index  = self.append(ir.Select(lt_0, from_end, index))
-        mapped_ge_0   = self.append(ir.Compare(ast.GtE(loc=None),
-                                               mapped_index, ir.Constant(0, mapped_index.type)))
-        end_cmpop     = ast.LtE(loc=None) if one_past_the_end else ast.Lt(loc=None)
-        mapped_lt_len = self.append(ir.Compare(end_cmpop, mapped_index, length))
-        in_bounds     = self.append(ir.Select(mapped_ge_0, mapped_lt_len,
-                                              ir.Constant(False, builtins.TBool())))
+        if isinstance(index, ir.Constant) and isinstance(length, ir.Constant) and \
+                isinstance(index.value, int) and index.value >= 0:
+            # The index is statically known to be in bounds; no check needed.
+            if index.value < length.value or \
+                    (one_past_the_end and index.value == length.value):
+                return index
+
+        append = self.append
+        lt_0          = append(ir.Compare(_LT,
+                                          index, self._const(0, index.type)))
+        from_end      = append(ir.Arith(_ADD, length, index))
+        mapped_index  = append(ir.Select(lt_0, from_end, index))
+        mapped_ge_0   = append(ir.Compare(_GTE,
+                                          mapped_index, self._const(0, mapped_index.type)))
+        end_cmpop     = _LTE if one_past_the_end else _LT
+        mapped_lt_len = append(ir.Compare(end_cmpop, mapped_index, length))
+        in_bounds     = append(ir.Select(mapped_ge_0, mapped_lt_len,
+                                         self._const(False, _T_BOOL)))
         head = self.current_block
 
         self._make_check(
@@ -1182,22 +1403,33 @@ class ARTIQIRGenerator(algorithm.Visitor):
         #               returns next loop variable value
         init_block = self.current_block
 
-        self.current_block = head_block = self.add_block("{}.head".format(name))
+        self.current_block = head_block = self.add_block(self._name("{}.head", name))
         init_block.append(ir.Branch(head_block))
         phi = self.append(ir.Phi(init.type))
         phi.add_incoming(init, init_block)
         cond = cond_gen(phi)
 
-        self.current_block = body_block = self.add_block("{}.body".format(name))
+        self.current_block = body_block = self.add_block(self._name("{}.body", name))
         body = body_gen(phi)
         self.append(ir.Branch(head_block))
         phi.add_incoming(body, self.current_block)
 
-        self.current_block = tail_block = self.add_block("{}.tail".format(name))
+        self.current_block = tail_block = self.add_block(self._name("{}.tail", name))
         head_block.append(ir.BranchIf(cond, body_block, tail_block))
 
         return head_block, body_block, tail_block
 
+    def _make_counted_loop(self, count, body_gen, name="loop"):
+        # count:    'iter Value, number of iterations
+        # body_gen: lambda('iter Value), loop body, called with
+        #               the loop variable counting up from 0
+        def step_gen(index):
+            body_gen(index)
+            return self.append(ir.Arith(_ADD, index, self._const(1, index.type)))
+        return self._make_loop(self._const(0, count.type),
+            lambda index: self.append(ir.Compare(_LT, index, count)),
+            step_gen, name)
+
     def visit_SubscriptT(self, node):
         try:
             old_assign, self.current_assign = self.current_assign, None
@@ -1219,7 +1451,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
             index = node.slice.value.n
             indexed = self.append(
-                ir.GetAttr(value, index, name="{}.e{}".format(value.name, index)),
+                ir.GetAttr(value, index, name=self._name("{}.e{}", value.name, index)),
                 loc=node.loc
             )
 
@@ -1238,9 +1470,9 @@ class ARTIQIRGenerator(algorithm.Visitor):
             # (i.e. arrays, which are reference types).
             if types.is_tuple(index.type):
                 num_idxs = len(index.type.find().elts)
-                indices = [
-                    self.append(ir.GetAttr(index, i)) for i in range(num_idxs)
-                ]
+                indices = self.extend([
+                    ir.GetAttr(index, i) for i in range(num_idxs)
+                ])
             else:
                 indices = [index]
             indexed = value
@@ -1249,12 +1481,15 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 mapped_index = self._map_index(length, idx, loc=node.begin_loc)
                 if self.current_assign is None or i < len(indices) - 1:
                     indexed = self.iterable_get(indexed, mapped_index)
-                    indexed.set_name("{}.at.{}".format(indexed.name,
-                                                       _readable_name(idx)))
+                    # Indexing a range with a zero start and unit step yields
+                    # the index itself, which must keep its own name.
+                    if not isinstance(indexed, ir.Constant) and indexed is not mapped_index:
+                        indexed.set_name(self._name("{}.at.{}", indexed.name,
+                                                    _readable_name(idx)))
                 else:
                     self.append(ir.SetElem(indexed, mapped_index, self.current_assign,
-                                           name="{}.at.{}".format(value.name,
-                                                                  _readable_name(index))))
+                                           name=self._name("{}.at.{}", value.name,
+                                                           _readable_name(index))))
             if self.current_assign is None:
                 return indexed
         else:
@@ -1271,7 +1506,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 finally:
                     self.current_assign = old_assign
             else:
-                start_index = ir.Constant(0, node.slice.type)
+                start_index = self._const(0, node.slice.type)
             mapped_start_index = self._map_index(length, start_index,
                                                  loc=node.begin_loc)
 
@@ -1281,10 +1516,11 @@ class ARTIQIRGenerator(algorithm.Visitor):
                     stop_index = self.visit(node.slice.upper)
                 finally:
                     self.current_assign = old_assign
+                mapped_stop_index = self._map_index(length, stop_index, one_past_the_end=True,
+                                                    loc=node.begin_loc)
             else:
-                stop_index = length
-            mapped_stop_index = self._map_index(length, stop_index, one_past_the_end=True,
-                                                loc=node.begin_loc)
+                # The end of the iterable is always a valid stop index.
+                mapped_stop_index = length
 
             if builtins.is_array(node.type):
                 # To implement strided slicing with the proper NumPy reference
@@ -1297,26 +1533,29 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 # One-dimensionally slicing an array only affects the outermost
                 # dimension.
                 shape = self.append(ir.GetAttr(value, "shape"))
-                lengths = [
-                    self.append(ir.GetAttr(shape, i))
+                lengths = self.extend([
+                    ir.GetAttr(shape, i)
                     for i in range(len(shape.type.elts))
-                ]
+                ])
 
                 # Compute outermost length – zero for "backwards" indices.
                 raw_len = self.append(
-                    ir.Arith(ast.Sub(loc=None), mapped_stop_index, mapped_start_index))
+                    ir.Arith(_SUB, mapped_stop_index, mapped_start_index))
                 is_neg_len = self.append(
-                    ir.Compare(ast.Lt(loc=None), raw_len, ir.Constant(0, raw_len.type)))
+                    ir.Compare(_LT, raw_len, self._const(0, raw_len.type)))
                 outer_len = self.append(
-                    ir.Select(is_neg_len, ir.Constant(0, raw_len.type), raw_len))
+                    ir.Select(is_neg_len, self._const(0, raw_len.type), raw_len))
                 new_shape = self._make_array_shape([outer_len] + lengths[1:])
 
                 # Offset buffer pointer by start index (times stride for inner dims).
-                stride = reduce(
-                    lambda l, r: self.append(ir.Arith(ast.Mult(loc=None), l, r)),
-                    lengths[1:], ir.Constant(1, lengths[0].type))
-                offset = self.append(
-                    ir.Arith(ast.Mult(loc=None), stride, mapped_start_index))
+                if len(lengths) > 1:
+                    stride = reduce(
+                        lambda l, r: self.append(ir.Arith(_MULT, l, r)),
+                        lengths[2:], lengths[1])
+                    offset = self.append(
+                        ir.Arith(_MULT, stride, mapped_start_index))
+                else:
+                    offset = mapped_start_index
                 buffer = self.append(ir.GetAttr(value, "buffer"))
                 new_buffer = self.append(ir.Offset(buffer, offset))
 
@@ -1330,28 +1569,35 @@ class ARTIQIRGenerator(algorithm.Visitor):
                         self.current_assign = old_assign
 
                     self._make_check(
-                        self.append(ir.Compare(ast.NotEq(loc=None), step, ir.Constant(0, step.type))),
+                        self.append(ir.Compare(_NOTEQ, step, self._const(0, step.type))),
                         lambda: self.alloc_exn(builtins.TException("ValueError"),
                             ir.Constant("step cannot be zero", builtins.TStr())),
                         loc=node.slice.step.loc)
                 else:
-                    step = ir.Constant(1, node.slice.type)
-                counting_up = self.append(ir.Compare(ast.Gt(loc=None), step,
-                                                    ir.Constant(0, step.type)))
-
-                unstepped_size = self.append(ir.Arith(ast.Sub(loc=None),
-                                                    mapped_stop_index, mapped_start_index))
-                slice_size_a = self.append(ir.Arith(ast.FloorDiv(loc=None), unstepped_size, step))
-                slice_size_b = self.append(ir.Arith(ast.Mod(loc=None), unstepped_size, step))
-                rem_not_empty = self.append(ir.Compare(ast.NotEq(loc=None), slice_size_b,
-                                                    ir.Constant(0, slice_size_b.type)))
-                slice_size_c = self.append(ir.Arith(ast.Add(loc=None), slice_size_a,
-                                                    ir.Constant(1, slice_size_a.type)))
-                slice_size = self.append(ir.Select(rem_not_empty,
-                                                slice_size_c, slice_size_a,
-                                                name="slice.size"))
+                    step = self._const(1, node.slice.type)
+                append = self.append
+                if isinstance(step, ir.Constant):
+                    counting_up = self._const(step.value > 0, _T_BOOL)
+                else:
+                    counting_up = append(ir.Compare(_GT, step,
+                                                   self._const(0, step.type)))
+
+                unstepped_size = append(ir.Arith(_SUB,
+                                               mapped_stop_index, mapped_start_index))
+                if isinstance(step, ir.Constant) and step.value == 1:
+                    slice_size = unstepped_size
+                else:
+                    slice_size_a = append(ir.Arith(_FLOORDIV, unstepped_size, step))
+                    slice_size_b = append(ir.Arith(_MOD, unstepped_size, step))
+                    rem_not_empty = append(ir.Compare(_NOTEQ, slice_size_b,
+                                                   self._const(0, slice_size_b.type)))
+                    slice_size_c = append(ir.Arith(_ADD, slice_size_a,
+                                                   self._const(1, slice_size_a.type)))
+                    slice_size = append(ir.Select(rem_not_empty,
+                                               slice_size_c, slice_size_a,
+                                               name="slice.size"))
                 self._make_check(
-                    self.append(ir.Compare(ast.LtE(loc=None), slice_size, length)),
+                    append(ir.Compare(_LTE, slice_size, length)),
                     lambda slice_size, length: self.alloc_exn(builtins.TException("ValueError"),
                         ir.Constant("slice size {0} is larger than iterable length {1}",
                                     builtins.TStr()),
@@ -1360,12 +1606,12 @@ class ARTIQIRGenerator(algorithm.Visitor):
                     loc=node.slice.loc)
 
                 if self.current_assign is None:
-                    is_neg_size = self.append(ir.Compare(ast.Lt(loc=None),
-                                                        slice_size, ir.Constant(0, slice_size.type)))
-                    abs_slice_size = self.append(ir.Select(is_neg_size,
-                                                        ir.Constant(0, slice_size.type), slice_size))
-                    other_value = self.append(ir.Alloc([abs_slice_size], value.type,
-                                                    name="slice.result"))
+                    is_neg_size = append(ir.Compare(_LT,
+                                                   slice_size, self._const(0, slice_size.type)))
+                    abs_slice_size = append(ir.Select(is_neg_size,
+                                                   self._const(0, slice_size.type), slice_size))
+                    other_value = append(ir.Alloc([abs_slice_size], value.type,
+                                               name="slice.result"))
                 else:
                     other_value = self.current_assign
 
@@ -1374,33 +1620,38 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 head = self.current_block = self.add_block("slice.head")
                 prehead.append(ir.Branch(head))
 
-                index = self.append(ir.Phi(node.slice.type,
-                                        name="slice.index"))
+                index = append(ir.Phi(node.slice.type,
+                                   name="slice.index"))
                 index.add_incoming(mapped_start_index, prehead)
-                other_index = self.append(ir.Phi(node.slice.type,
-                                                name="slice.resindex"))
-                other_index.add_incoming(ir.Constant(0, node.slice.type), prehead)
+                other_index = append(ir.Phi(node.slice.type,
+                                           name="slice.resindex"))
+                other_index.add_incoming(self._const(0, node.slice.type), prehead)
 
                 # Still within bounds?
-                bounded_up = self.append(ir.Compare(ast.Lt(loc=None), index, mapped_stop_index))
-                bounded_down = self.append(ir.Compare(ast.Gt(loc=None), index, mapped_stop_index))
-                within_bounds = self.append(ir.Select(counting_up, bounded_up, bounded_down))
+                if not isinstance(counting_up, ir.Constant):
+                    bounded_up = append(ir.Compare(_LT, index, mapped_stop_index))
+                    bounded_down = append(ir.Compare(_GT, index, mapped_stop_index))
+                    within_bounds = append(ir.Select(counting_up, bounded_up, bounded_down))
+                elif counting_up.value:
+                    within_bounds = append(ir.Compare(_LT, index, mapped_stop_index))
+                else:
+                    within_bounds = append(ir.Compare(_GT, index, mapped_stop_index))
 
                 body = self.current_block = self.add_block("slice.body")
 
                 if self.current_assign is None:
                     elem = self.iterable_get(value, index)
-                    self.append(ir.SetElem(other_value, other_index, elem))
+                    append(ir.SetElem(other_value, other_index, elem))
                 else:
-                    elem = self.append(ir.GetElem(self.current_assign, other_index))
-                    self.append(ir.SetElem(value, index, elem))
+                    elem = append(ir.GetElem(self.current_assign, other_index))
+                    append(ir.SetElem(value, index, elem))
 
-                next_index = self.append(ir.Arith(ast.Add(loc=None), index, step))
+                next_index = append(ir.Arith(_ADD, index, step))
                 index.add_incoming(next_index, body)
-                next_other_index = self.append(ir.Arith(ast.Add(loc=None), other_index,
-                                                        ir.Constant(1, node.slice.type)))
+                next_other_index = append(ir.Arith(_ADD, other_index,
+                                                   self._const(1, node.slice.type)))
                 other_index.add_incoming(next_other_index, body)
-                self.append(ir.Branch(head))
+                append(ir.Branch(head))
 
                 tail = self.current_block = self.add_block("slice.tail")
                 head.append(ir.BranchIf(within_bounds, body, tail))
@@ -1414,11 +1665,16 @@ class ARTIQIRGenerator(algorithm.Visitor):
         else:
             try:
                 old_assign = self.current_assign
+                # Extracting the elements has no side effects, so extract them all
+                # up front and then assign them in order.
+                elts = []
                 for index, elt_node in enumerate(node.elts):
-                    self.current_assign = \
-                        self.append(ir.GetAttr(old_assign, index,
-                                               name="{}.e{}".format(old_assign.name, index)),
-                                    loc=elt_node.loc)
+                    elt = ir.GetAttr(old_assign, index,
+                                     name=self._name("{}.e{}", old_assign.name, index))
+                    elt.loc = elt_node.loc
+                    elts.append(elt)
+                for elt, elt_node in zip(self.extend(elts), node.elts):
+                    self.current_assign = elt
                     self.visit(elt_node)
             finally:
                 self.current_assign = old_assign
@@ -1426,16 +1682,13 @@ class ARTIQIRGenerator(algorithm.Visitor):
     def visit_ListT(self, node):
         if self.current_assign is None:
             elts = [self.visit(elt_node) for elt_node in node.elts]
-            lst = self.append(ir.Alloc([ir.Constant(len(node.elts), self._size_type)],
-                                       node.type))
-            for index, elt_node in enumerate(elts):
-                self.append(ir.SetElem(lst, ir.Constant(index, self._size_type), elt_node))
-            return lst
+            return self.append(ir.Alloc([self._const(len(node.elts), self._size_type)] + elts,
+                                        node.type))
         else:
             length = self.iterable_len(self.current_assign)
             self._make_check(
-                self.append(ir.Compare(ast.Eq(loc=None), length,
-                                       ir.Constant(len(node.elts), self._size_type))),
+                self.append(ir.Compare(_EQ, length,
+                                       self._const(len(node.elts), self._size_type))),
                 lambda length: self.alloc_exn(builtins.TException("ValueError"),
                     ir.Constant("list must be {0} elements long to decompose", builtins.TStr()),
                     length),
@@ -1443,7 +1696,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
             for index, elt_node in enumerate(node.elts):
                 elt = self.append(ir.GetElem(self.current_assign,
-                                             ir.Constant(index, self._size_type)))
+                                             self._const(index, self._size_type)))
                 try:
                     old_assign, self.current_assign = self.current_assign, elt
                     self.visit(elt_node)
@@ -1459,6 +1712,18 @@ class ARTIQIRGenerator(algorithm.Visitor):
         length = self.iterable_len(iterable)
         result = self.append(ir.Alloc([length], node.type))
 
+        # [x for x in xs] over a list of the same element type is a plain copy
+        # of the element buffer; there is nothing to evaluate per element.
+        elt_type = builtins.get_iterable_elt(node.type)
+        if isinstance(comprehension.target, asttyped.NameT) and \
+                isinstance(node.elt, asttyped.NameT) and \
+                node.elt.id == comprehension.target.id and \
+                builtins.is_list(iterable.type) and \
+                builtins.get_iterable_elt(iterable.type) == elt_type:
+            zero = self._const(0, length.type)
+            self.copy_list_range(result, zero, iterable, zero, length)
+            return result
+
         try:
             gen_suffix = ".gen@{}:{}".format(node.loc.line(), node.loc.column())
             env_type = ir.TEnvironment(name=self.current_function.name + gen_suffix,
@@ -1478,17 +1743,46 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
                 mapped_elt = self.visit(node.elt)
                 self.append(ir.SetElem(result, index, mapped_elt))
-                return self.append(ir.Arith(ast.Add(loc=None), index,
-                                            ir.Constant(1, length.type)))
-            self._make_loop(ir.Constant(0, length.type),
-                lambda index: self.append(ir.Compare(ast.Lt(loc=None), index, length)),
-                body_gen)
+            self._make_counted_loop(length, body_gen)
 
             return result
         finally:
             self.current_env = old_env
 
+    def _is_pure_scalar(self, node):
+        # Scalar expressions that have no side effects and cannot raise, so
+        # evaluating them eagerly cannot be told apart from short-circuiting.
+        if not (builtins.is_bool(node.type) or builtins.is_numeric(node.type)):
+            return False
+        elif isinstance(node, (asttyped.NumT, asttyped.NameConstantT, asttyped.NameT)):
+            return True
+        elif isinstance(node, asttyped.CoerceT):
+            return self._is_pure_scalar(node.value)
+        elif isinstance(node, asttyped.UnaryOpT):
+            return isinstance(node.op, (ast.Not, ast.USub, ast.UAdd)) and \
+                self._is_pure_scalar(node.operand)
+        elif isinstance(node, asttyped.CompareT):
+            return all(isinstance(op, (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE))
+                       for op in node.ops) and \
+                all(self._is_pure_scalar(operand)
+                    for operand in [node.left] + node.comparators)
+        else:
+            return False
+
     def visit_BoolOpT(self, node):
+        if all(self._is_pure_scalar(value_node) for value_node in node.values):
+            # Straight-line code; the result is the first value deciding
+            # the outcome, as with short-circuiting.
+            result = self.visit(node.values[0])
+            for value_node in node.values[1:]:
+                value = self.visit(value_node)
+                cond = self.coerce_to_bool(result)
+                if isinstance(node.op, ast.And):
+                    result = self.append(ir.Select(cond, value, result))
+                else:
+                    result = self.append(ir.Select(cond, result, value))
+            return result
+
         blocks = []
         for value_node in node.values:
             value_head = self.current_block
@@ -1552,12 +1846,8 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 a = self.append(ir.GetElem(arg_buffer, index))
                 self.append(
                     ir.SetElem(result_buffer, index, make_op(a)))
-                return self.append(
-                    ir.Arith(ast.Add(loc=None), index, ir.Constant(1, self._size_type)))
 
-            self._make_loop(
-                ir.Constant(0, self._size_type), lambda index: self.append(
-                    ir.Compare(ast.Lt(loc=None), index, num_total_elts)), body_gen)
+            self._make_counted_loop(num_total_elts, body_gen)
 
             self.append(ir.Return(ir.Constant(None, builtins.TNone())))
             return func
@@ -1579,17 +1869,15 @@ class ARTIQIRGenerator(algorithm.Visitor):
     def visit_UnaryOpT(self, node):
         if isinstance(node.op, ast.Not):
             cond = self.coerce_to_bool(self.visit(node.operand))
-            return self.append(ir.Select(cond,
-                        ir.Constant(False, builtins.TBool()),
-                        ir.Constant(True,  builtins.TBool())))
+            return self.invert(cond)
         elif isinstance(node.op, ast.Invert):
             operand = self.visit(node.operand)
-            return self.append(ir.Arith(ast.BitXor(loc=None),
-                                        ir.Constant(-1, operand.type), operand))
+            return self.append(ir.Arith(_BITXOR,
+                                        self._const(-1, operand.type), operand))
         elif isinstance(node.op, ast.USub):
             def make_sub(val):
-                return self.append(ir.Arith(ast.Sub(loc=None),
-                                        ir.Constant(0, val.type), val))
+                return self.append(ir.Arith(_SUB,
+                                        self._const(0, val.type), val))
             operand = self.visit(node.operand)
             if builtins.is_array(operand.type):
                 shape = self.append(ir.GetAttr(operand, "shape"))
@@ -1607,7 +1895,9 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
     def visit_CoerceT(self, node):
         value = self.visit(node.value)
-        if node.type.find() == value.type:
+        # Most coercions are between identical types; avoid resolving
+        # and structurally comparing them when the instance is shared.
+        if node.type is value.type or node.type.find() == value.type:
             return value
         else:
             if builtins.is_array(node.type):
@@ -1623,14 +1913,14 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 return self.append(
                     ir.Coerce(value,
                               node.type,
-                              name="{}.{}".format(_readable_name(value),
-                                                  node.type.name)))
+                              name=self._name("{}.{}", _readable_name(value),
+                                              node.type.name)))
 
     def _get_total_array_len(self, shape):
-        lengths = [
-            self.append(ir.GetAttr(shape, i)) for i in range(len(shape.type.elts))
-        ]
-        return reduce(lambda l, r: self.append(ir.Arith(ast.Mult(loc=None), l, r)),
+        lengths = self.extend([
+            ir.GetAttr(shape, i) for i in range(len(shape.type.elts))
+        ])
+        return reduce(lambda l, r: self.append(ir.Arith(_MULT, l, r)),
                       lengths[1:], lengths[0])
 
     def _allocate_new_array(self, elt, shape):
@@ -1710,14 +2000,8 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 r = get_right(index)
                 result = make_op(l, r)
                 self.append(ir.SetElem(result_buffer, index, result))
-                return self.append(
-                    ir.Arith(ast.Add(loc=None), index,
-                             ir.Constant(1, self._size_type)))
 
-            self._make_loop(
-                ir.Constant(0, self._size_type), lambda index: self.append(
-                    ir.Compare(ast.Lt(loc=None), index, num_total_elts)),
-                loop_gen)
+            self._make_counted_loop(num_total_elts, loop_gen)
 
         return self._make_array_binop(name, result_type, lhs_type, rhs_type,
                                       body_gen)
@@ -1762,8 +2046,8 @@ class ARTIQIRGenerator(algorithm.Visitor):
     def _get_array_offset(self, shape, indices):
         result = indices[0]
         for dim, index in zip(shape[1:], indices[1:]):
-            result = self.append(ir.Arith(ast.Mult(loc=None), result, dim))
-            result = self.append(ir.Arith(ast.Add(loc=None), result, index))
+            result = self.append(ir.Arith(_MULT, result, dim))
+            result = self.append(ir.Arith(_ADD, result, index))
         return result
 
     def _get_matmult(self, result_type, lhs_type, rhs_type):
@@ -1789,10 +2073,10 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
                 def row_loop(row_idx):
                     lhs_base_offset = self.append(
-                        ir.Arith(ast.Mult(loc=None), row_idx, num_summands))
+                        ir.Arith(_MULT, row_idx, num_summands))
                     lhs_base = self.append(ir.Offset(lhs_buffer, lhs_base_offset))
                     result_base_offset = self.append(
-                        ir.Arith(ast.Mult(loc=None), row_idx, num_cols))
+                        ir.Arith(_MULT, row_idx, num_cols))
                     result_base = self.append(
                         ir.Offset(result_buffer, result_base_offset))
 
@@ -1805,40 +2089,23 @@ class ARTIQIRGenerator(algorithm.Visitor):
                         def sum_loop(sum_idx):
                             lhs_elem = self.append(ir.GetElem(lhs_base, sum_idx))
                             rhs_offset = self.append(
-                                ir.Arith(ast.Mult(loc=None), sum_idx, num_cols))
+                                ir.Arith(_MULT, sum_idx, num_cols))
                             rhs_elem = self.append(ir.GetElem(rhs_base, rhs_offset))
                             product = self.append(
-                                ir.Arith(ast.Mult(loc=None), lhs_elem, rhs_elem))
+                                ir.Arith(_MULT, lhs_elem, rhs_elem))
                             prev_total = self.append(ir.GetLocal(env, "$total"))
                             total = self.append(
-                                ir.Arith(ast.Add(loc=None), prev_total, product))
+                                ir.Arith(_ADD, prev_total, product))
                             self.append(ir.SetLocal(env, "$total", total))
-                            return self.append(
-                                ir.Arith(ast.Add(loc=None), sum_idx,
-                                         ir.Constant(1, self._size_type)))
 
-                        self._make_loop(
-                            ir.Constant(0, self._size_type), lambda index: self.append(
-                                ir.Compare(ast.Lt(loc=None), index, num_summands)),
-                            sum_loop)
+                        self._make_counted_loop(num_summands, sum_loop)
 
                         total = self.append(ir.GetLocal(env, "$total"))
                         self.append(ir.SetElem(result_base, col_idx, total))
 
-                        return self.append(
-                            ir.Arith(ast.Add(loc=None), col_idx,
-                                     ir.Constant(1, self._size_type)))
-
-                    self._make_loop(
-                        ir.Constant(0, self._size_type), lambda index: self.append(
-                            ir.Compare(ast.Lt(loc=None), index, num_cols)), col_loop)
-                    return self.append(
-                        ir.Arith(ast.Add(loc=None), row_idx,
-                                 ir.Constant(1, self._size_type)))
+                    self._make_counted_loop(num_cols, col_loop)
 
-                self._make_loop(
-                    ir.Constant(0, self._size_type), lambda index: self.append(
-                        ir.Compare(ast.Lt(loc=None), index, num_rows)), row_loop)
+                self._make_counted_loop(num_rows, row_loop)
 
             self.array_op_funcs[name] = self._make_array_binop(
                 name, result_type, lhs_type, rhs_type, body_gen)
@@ -1847,7 +2114,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
     def _get_matmult_shapes(self, lhs, rhs):
         lhs_shape = self.append(ir.GetAttr(lhs, "shape"))
         if lhs.type["num_dims"].value == 1:
-            lhs_shape_outer = ir.Constant(1, self._size_type)
+            lhs_shape_outer = self._const(1, self._size_type)
             lhs_shape_inner = self.append(ir.GetAttr(lhs_shape, 0))
         else:
             lhs_shape_outer = self.append(ir.GetAttr(lhs_shape, 0))
@@ -1856,7 +2123,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         rhs_shape = self.append(ir.GetAttr(rhs, "shape"))
         if rhs.type["num_dims"].value == 1:
             rhs_shape_inner = self.append(ir.GetAttr(rhs_shape, 0))
-            rhs_shape_outer = ir.Constant(1, self._size_type)
+            rhs_shape_outer = self._const(1, self._size_type)
         else:
             rhs_shape_inner = self.append(ir.GetAttr(rhs_shape, 0))
             rhs_shape_outer = self.append(ir.GetAttr(rhs_shape, 1))
@@ -1873,7 +2140,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
         num_rows, lhs_inner, rhs_inner, num_cols = self._get_matmult_shapes(lhs, rhs)
         self._make_check(
-            self.append(ir.Compare(ast.Eq(loc=None), lhs_inner, rhs_inner)),
+            self.append(ir.Compare(_EQ, lhs_inner, rhs_inner)),
             lambda lhs_inner, rhs_inner: self.alloc_exn(
                 builtins.TException("ValueError"),
                 ir.Constant(
@@ -1902,7 +2169,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
             shape = self._make_array_shape(
                 [num_cols if lhs.type["num_dims"].value == 1 else num_rows])
             return self.append(ir.Alloc([result_buffer, shape], node.type))
-        return self.append(ir.GetElem(result_buffer, ir.Constant(0, self._size_type)))
+        return self.append(ir.GetElem(result_buffer, self._const(0, self._size_type)))
 
     def _broadcast_binop(self, name, make_op, result_type, lhs, rhs, assign_to_lhs):
         # Broadcast scalars (broadcasting higher dimensions is not yet allowed in the
@@ -1920,7 +2187,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         if not broadcast:
             rhs_shape = self.append(ir.GetAttr(rhs, "shape"))
             self._make_check(
-                self.append(ir.Compare(ast.Eq(loc=None), shape, rhs_shape)),
+                self.append(ir.Compare(_EQ, shape, rhs_shape)),
                 lambda: self.alloc_exn(
                     builtins.TException("ValueError"),
                     ir.Constant("operands could not be broadcast together",
@@ -1952,13 +2219,13 @@ class ARTIQIRGenerator(algorithm.Visitor):
             if isinstance(node.op, (ast.LShift, ast.RShift)):
                 # Check for negative shift amount.
                 self._make_check(
-                    self.append(ir.Compare(ast.GtE(loc=None), rhs, ir.Constant(0, rhs.type))),
+                    self.append(ir.Compare(_GTE, rhs, self._const(0, rhs.type))),
                     lambda: self.alloc_exn(builtins.TException("ValueError"),
                         ir.Constant("shift amount must be nonnegative", builtins.TStr())),
                     loc=node.right.loc)
             elif isinstance(node.op, (ast.Div, ast.FloorDiv, ast.Mod)):
                 self._make_check(
-                    self.append(ir.Compare(ast.NotEq(loc=None), rhs, ir.Constant(0, rhs.type))),
+                    self.append(ir.Compare(_NOTEQ, rhs, self._const(0, rhs.type))),
                     lambda: self.alloc_exn(builtins.TException("ZeroDivisionError"),
                         ir.Constant("cannot divide by zero", builtins.TStr())),
                     loc=node.right.loc)
@@ -1967,39 +2234,18 @@ class ARTIQIRGenerator(algorithm.Visitor):
         elif isinstance(node.op, ast.Add): # list + list, tuple + tuple, str + str
             lhs, rhs = self.visit(node.left), self.visit(node.right)
             if types.is_tuple(node.left.type) and types.is_tuple(node.right.type):
-                elts = []
-                for index, elt in enumerate(node.left.type.elts):
-                    elts.append(self.append(ir.GetAttr(lhs, index)))
-                for index, elt in enumerate(node.right.type.elts):
-                    elts.append(self.append(ir.GetAttr(rhs, index)))
-                return self.append(ir.Alloc(elts, node.type))
+                return self.append(ir.Builtin("tuple_concat", [lhs, rhs], node.type))
             elif builtins.is_listish(node.left.type) and builtins.is_listish(node.right.type):
                 lhs_length = self.iterable_len(lhs)
                 rhs_length = self.iterable_len(rhs)
 
-                result_length = self.append(ir.Arith(ast.Add(loc=None), lhs_length, rhs_length))
+                result_length = self.append(ir.Arith(_ADD, lhs_length, rhs_length))
                 result = self.append(ir.Alloc([result_length], node.type))
 
-                # Copy lhs
-                def body_gen(index):
-                    elt = self.append(ir.GetElem(lhs, index))
-                    self.append(ir.SetElem(result, index, elt))
-                    return self.append(ir.Arith(ast.Add(loc=None), index,
-                                                ir.Constant(1, self._size_type)))
-                self._make_loop(ir.Constant(0, self._size_type),
-                    lambda index: self.append(ir.Compare(ast.Lt(loc=None), index, lhs_length)),
-                    body_gen)
-
-                # Copy rhs
-                def body_gen(index):
-                    elt = self.append(ir.GetElem(rhs, index))
-                    result_index = self.append(ir.Arith(ast.Add(loc=None), index, lhs_length))
-                    self.append(ir.SetElem(result, result_index, elt))
-                    return self.append(ir.Arith(ast.Add(loc=None), index,
-                                                ir.Constant(1, self._size_type)))
-                self._make_loop(ir.Constant(0, self._size_type),
-                    lambda index: self.append(ir.Compare(ast.Lt(loc=None), index, rhs_length)),
-                    body_gen)
+                # Both operands are copied wholesale into adjacent ranges of the result.
+                zero = self._const(0, self._size_type)
+                self.copy_list_range(result, zero, lhs, zero, lhs_length)
+                self.copy_list_range(result, lhs_length, rhs, zero, rhs_length)
 
                 return result
             else:
@@ -2015,30 +2261,16 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
             lst_length = self.iterable_len(lst)
 
-            result_length = self.append(ir.Arith(ast.Mult(loc=None), lst_length, num))
+            result_length = self.append(ir.Arith(_MULT, lst_length, num))
             result = self.append(ir.Alloc([result_length], node.type))
 
-            # num times...
-            def body_gen(num_index):
-                # ... copy the list
-                def body_gen(lst_index):
-                    elt = self.append(ir.GetElem(lst, lst_index))
-                    base_index = self.append(ir.Arith(ast.Mult(loc=None),
-                                                      num_index, lst_length))
-                    result_index = self.append(ir.Arith(ast.Add(loc=None),
-                                                        base_index, lst_index))
-                    self.append(ir.SetElem(result, base_index, elt))
-                    return self.append(ir.Arith(ast.Add(loc=None), lst_index,
-                                                ir.Constant(1, self._size_type)))
-                self._make_loop(ir.Constant(0, self._size_type),
-                    lambda index: self.append(ir.Compare(ast.Lt(loc=None), index, lst_length)),
-                    body_gen)
-
-                return self.append(ir.Arith(ast.Add(loc=None), num_index,
-                                            ir.Constant(1, self._size_type)))
-            self._make_loop(ir.Constant(0, self._size_type),
-                lambda index: self.append(ir.Compare(ast.Lt(loc=None), index, num)),
-                body_gen)
+            # num times copy the list into the next lst_length elements
+            if not builtins.is_none(builtins.get_iterable_elt(node.type)):
+                def body_gen(num_index):
+                    base_index = self.append(ir.Arith(_MULT, num_index, lst_length))
+                    self.copy_list_range(result, base_index, lst,
+                                         self._const(0, self._size_type), lst_length)
+                self._make_counted_loop(num, body_gen)
 
             return result
         else:
@@ -2052,31 +2284,73 @@ class ARTIQIRGenerator(algorithm.Visitor):
         elif builtins.is_bool(lhs.type) and builtins.is_bool(rhs.type):
             return self.append(ir.Compare(op, lhs, rhs))
         elif types.is_tuple(lhs.type) and types.is_tuple(rhs.type):
-            result = None
+            elt_count = len(lhs.type.elts)
+            if 1 < elt_count <= _MAX_STRAIGHT_TUPLE_COMPARE and \
+                    all(builtins.is_bool(elt) or builtins.is_numeric(elt)
+                        for elt in lhs.type.elts + rhs.type.elts):
+                # Comparing a few scalars is cheaper than branching after each.
+                lhs_elts = self.extend([ir.GetAttr(lhs, index) for index in range(elt_count)])
+                rhs_elts = self.extend([ir.GetAttr(rhs, index) for index in range(elt_count)])
+                return reduce(lambda result, elt_result:
+                                  self.append(ir.Arith(_BITAND, result, elt_result)),
+                              [self.append(ir.Compare(op, lhs_elt, rhs_elt))
+                               for lhs_elt, rhs_elt in zip(lhs_elts, rhs_elts)])
+
+            # Stop at the first pair of elements for which the comparison
+            # is false; the remaining elements are never loaded.
+            blocks = []
             for index in range(len(lhs.type.elts)):
+                if index > 0:
+                    self.current_block = self.add_block("compare.elt")
+                elt_head = self.current_block
                 lhs_elt = self.append(ir.GetAttr(lhs, index))
                 rhs_elt = self.append(ir.GetAttr(rhs, index))
                 elt_result = self.polymorphic_compare_pair(op, lhs_elt, rhs_elt)
-                if result is None:
-                    result = elt_result
-                else:
-                    result = self.append(ir.Select(result, elt_result,
-                                                   ir.Constant(False, builtins.TBool())))
-            return result
+                blocks.append((elt_result, elt_head, self.current_block))
+
+            if len(blocks) == 0:
+                return self._const(isinstance(op, (ast.Eq, ast.LtE, ast.GtE)), _T_BOOL)
+            elif len(blocks) == 1:
+                return blocks[0][0]
+
+            tail = self.current_block = self.add_block("compare.tail")
+            phi = self.append(ir.Phi(_T_BOOL))
+            for (elt_result, elt_head, elt_tail), (_, next_elt_head, _) in \
+                    zip(blocks, blocks[1:]):
+                elt_tail.append(ir.BranchIf(elt_result, next_elt_head, tail))
+                phi.add_incoming(self._const(False, _T_BOOL), elt_tail)
+            last_result, _, last_tail = blocks[-1]
+            last_tail.append(ir.Branch(tail))
+            phi.add_incoming(last_result, last_tail)
+            return phi
         elif builtins.is_listish(lhs.type) and builtins.is_listish(rhs.type):
             head = self.current_block
             lhs_length = self.iterable_len(lhs)
             rhs_length = self.iterable_len(rhs)
+
+            lhs_elt_type = builtins.get_iterable_elt(lhs.type)
+            if isinstance(op, ast.Eq) and \
+                    not builtins.is_array(lhs.type) and not builtins.is_array(rhs.type) and \
+                    _is_bitwise_comparable(lhs_elt_type) and \
+                    builtins.get_iterable_elt(rhs.type) == lhs_elt_type:
+                # Compare no elements at all if the lengths differ, so that
+                # the shorter operand is never read past its end.
+                eq_length = self.append(ir.Compare(_EQ, lhs_length, rhs_length))
+                count = self.append(ir.Select(eq_length, lhs_length,
+                                              self._const(0, lhs_length.type)))
+                eq_elts = self.append(ir.Builtin("list_memcmp", [lhs, rhs, count], _T_BOOL))
+                return self.append(ir.Arith(_BITAND, eq_length, eq_elts))
+
             compare_length = self.append(ir.Compare(op, lhs_length, rhs_length))
-            eq_length = self.append(ir.Compare(ast.Eq(loc=None), lhs_length, rhs_length))
+            eq_length = self.append(ir.Compare(_EQ, lhs_length, rhs_length))
 
             # If the length is the same, compare element-by-element
             # and break when the comparison result is false
             loop_head = self.add_block("compare.head")
             self.current_block = loop_head
             index_phi = self.append(ir.Phi(self._size_type))
-            index_phi.add_incoming(ir.Constant(0, self._size_type), head)
-            loop_cond = self.append(ir.Compare(ast.Lt(loc=None), index_phi, lhs_length))
+            index_phi.add_incoming(self._const(0, self._size_type), head)
+            loop_cond = self.append(ir.Compare(_LT, index_phi, lhs_length))
 
             loop_body = self.add_block("compare.body")
             self.current_block = loop_body
@@ -2087,28 +2361,23 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
             loop_body2 = self.add_block("compare.body2")
             self.current_block = loop_body2
-            index_next = self.append(ir.Arith(ast.Add(loc=None), index_phi,
-                                              ir.Constant(1, self._size_type)))
+            index_next = self.append(ir.Arith(_ADD, index_phi,
+                                              self._const(1, self._size_type)))
             self.append(ir.Branch(loop_head))
             index_phi.add_incoming(index_next, loop_body2)
 
             tail = self.add_block("compare.tail")
             self.current_block = tail
-            phi = self.append(ir.Phi(builtins.TBool()))
+            phi = self.append(ir.Phi(_T_BOOL))
             head.append(ir.BranchIf(eq_length, loop_head, tail))
             phi.add_incoming(compare_length, head)
             loop_head.append(ir.BranchIf(loop_cond, loop_body, tail))
-            phi.add_incoming(ir.Constant(True, builtins.TBool()), loop_head)
+            phi.add_incoming(self._const(True, _T_BOOL), loop_head)
             body_end.append(ir.BranchIf(body_result, loop_body2, tail))
             phi.add_incoming(body_result, body_end)
 
-            if isinstance(op, ast.NotEq):
-                result = self.append(ir.Select(phi,
-                    ir.Constant(False, builtins.TBool()), ir.Constant(True, builtins.TBool())))
-            else:
-                result = phi
-
-            return result
+            # NotEq never reaches here; polymorphic_compare_pair inverts Eq instead.
+            return phi
         else:
             loc = lhs.loc
             loc.end = rhs.loc.end
@@ -2121,19 +2390,27 @@ class ARTIQIRGenerator(algorithm.Visitor):
     def polymorphic_compare_pair_inclusion(self, needle, haystack):
         if builtins.is_range(haystack.type):
             # Optimized range `in` operator
-            start       = self.append(ir.GetAttr(haystack, "start"))
-            stop        = self.append(ir.GetAttr(haystack, "stop"))
-            step        = self.append(ir.GetAttr(haystack, "step"))
-            after_start = self.append(ir.Compare(ast.GtE(loc=None), needle, start))
-            after_stop  = self.append(ir.Compare(ast.Lt(loc=None), needle, stop))
-            from_start  = self.append(ir.Arith(ast.Sub(loc=None), needle, start))
-            mod_step    = self.append(ir.Arith(ast.Mod(loc=None), from_start, step))
-            on_step     = self.append(ir.Compare(ast.Eq(loc=None), mod_step,
-                                                 ir.Constant(0, mod_step.type)))
-            result      = self.append(ir.Select(after_start, after_stop,
-                                                ir.Constant(False, builtins.TBool())))
-            result      = self.append(ir.Select(result, on_step,
-                                                ir.Constant(False, builtins.TBool())))
+            bounds = self._constant_range_bounds(haystack)
+            if bounds is not None:
+                start, stop, step = haystack.operands
+            else:
+                start   = self.append(ir.GetAttr(haystack, "start"))
+                stop    = self.append(ir.GetAttr(haystack, "stop"))
+                step    = self.append(ir.GetAttr(haystack, "step"))
+            after_start = self.append(ir.Compare(_GTE, needle, start))
+            after_stop  = self.append(ir.Compare(_LT, needle, stop))
+            from_start  = self.append(ir.Arith(_SUB, needle, start))
+            if bounds is not None and bounds[2] > 0 and bounds[2] & (bounds[2] - 1) == 0:
+                # Python's modulo by a positive power of two is a mask,
+                # including for negative dividends.
+                mod_step = self.append(ir.Arith(_BITAND, from_start,
+                                                self._const(bounds[2] - 1, from_start.type)))
+            else:
+                mod_step = self.append(ir.Arith(_MOD, from_start, step))
+            on_step     = self.append(ir.Compare(_EQ, mod_step,
+                                                 self._const(0, mod_step.type)))
+            result      = self.append(ir.Arith(_BITAND, after_start, after_stop))
+            result      = self.append(ir.Arith(_BITAND, result, on_step))
         elif builtins.is_iterable(haystack.type):
             length = self.iterable_len(haystack)
 
@@ -2142,21 +2419,17 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 nonlocal cmp_result, loop_body2
 
                 elt = self.iterable_get(haystack, index)
-                cmp_result = self.polymorphic_compare_pair(ast.Eq(loc=None), needle, elt)
+                cmp_result = self.polymorphic_compare_pair(_EQ, needle, elt)
 
                 loop_body2 = self.add_block("compare.body")
                 self.current_block = loop_body2
-                return self.append(ir.Arith(ast.Add(loc=None), index,
-                                            ir.Constant(1, length.type)))
             loop_head, loop_body, loop_tail = \
-                self._make_loop(ir.Constant(0, length.type),
-                    lambda index: self.append(ir.Compare(ast.Lt(loc=None), index, length)),
-                    body_gen, name="compare")
+                self._make_counted_loop(length, body_gen, name="compare")
 
             loop_body.append(ir.BranchIf(cmp_result, loop_tail, loop_body2))
-            phi = loop_tail.prepend(ir.Phi(builtins.TBool()))
-            phi.add_incoming(ir.Constant(False, builtins.TBool()), loop_head)
-            phi.add_incoming(ir.Constant(True, builtins.TBool()), loop_body)
+            phi = loop_tail.prepend(ir.Phi(_T_BOOL))
+            phi.add_incoming(self._const(False, _T_BOOL), loop_head)
+            phi.add_incoming(self._const(True, _T_BOOL), loop_body)
 
             result = phi
         else:
@@ -2171,9 +2444,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         return result
 
     def invert(self, value):
-        return self.append(ir.Select(value,
-                    ir.Constant(False, builtins.TBool()),
-                    ir.Constant(True, builtins.TBool())))
+        return self.append(ir.Arith(_BITXOR, value, self._const(True, _T_BOOL)))
 
     def polymorphic_compare_pair(self, op, lhs, rhs):
         if isinstance(op, (ast.Is, ast.IsNot)):
@@ -2193,6 +2464,19 @@ class ARTIQIRGenerator(algorithm.Visitor):
             assert False
 
     def visit_CompareT(self, node):
+        if self._is_pure_scalar(node):
+            lhs = self.visit(node.left)
+            result = None
+            for op, rhs_node in zip(node.ops, node.comparators):
+                rhs = self.visit(rhs_node)
+                pair_result = self.polymorphic_compare_pair(op, lhs, rhs)
+                if result is None:
+                    result = pair_result
+                else:
+                    result = self.append(ir.Arith(_BITAND, result, pair_result))
+                lhs = rhs
+            return result
+
         # Essentially a sequence of `and`s performed over results
         # of comparisons.
         blocks = []
@@ -2227,8 +2511,8 @@ class ARTIQIRGenerator(algorithm.Visitor):
         attributes = [
             ir.Constant(name_id,        builtins.TInt32()),   # typeinfo
             ir.Constant("<not thrown>", builtins.TStr()),   # file
-            ir.Constant(0,              builtins.TInt32()), # line
-            ir.Constant(0,              builtins.TInt32()), # column
+            self._const(0,              builtins.TInt32()), # line
+            self._const(0,              builtins.TInt32()), # column
             ir.Constant("<not thrown>", builtins.TStr()),   # function
         ]
 
@@ -2248,7 +2532,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         param_type = builtins.TInt64()
         for param in [param0, param1, param2]:
             if param is None:
-                attributes.append(ir.Constant(0, builtins.TInt64()))
+                attributes.append(self._const(0, builtins.TInt64()))
             else:
                 if param.type != param_type:
                     param = self.append(ir.Coerce(param, param_type))
@@ -2261,7 +2545,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         typ = node.func.type
         if types.is_builtin(typ, "bool"):
             if len(node.args) == 0 and len(node.keywords) == 0:
-                return ir.Constant(False, builtins.TBool())
+                return self._const(False, _T_BOOL)
             elif len(node.args) == 1 and len(node.keywords) == 0:
                 arg = self.visit(node.args[0])
                 return self.coerce_to_bool(arg)
@@ -2270,7 +2554,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         elif types.is_builtin(typ, "int") or \
                 types.is_builtin(typ, "int32") or types.is_builtin(typ, "int64"):
             if len(node.args) == 0 and len(node.keywords) == 0:
-                return ir.Constant(0, node.type)
+                return self._const(0, node.type)
             elif len(node.args) == 1 and \
                     (len(node.keywords) == 0 or \
                      len(node.keywords) == 1 and node.keywords[0].arg == 'width'):
@@ -2281,7 +2565,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 assert False
         elif types.is_builtin(typ, "float"):
             if len(node.args) == 0 and len(node.keywords) == 0:
-                return ir.Constant(0.0, builtins.TFloat())
+                return self._const(0.0, builtins.TFloat())
             elif len(node.args) == 1 and len(node.keywords) == 0:
                 arg = self.visit(node.args[0])
                 return self.append(ir.Coerce(arg, node.type))
@@ -2290,22 +2574,27 @@ class ARTIQIRGenerator(algorithm.Visitor):
         elif (types.is_builtin(typ, "list") or
               types.is_builtin(typ, "bytearray") or types.is_builtin(typ, "bytes")):
             if len(node.args) == 0 and len(node.keywords) == 0:
-                length = ir.Constant(0, builtins.TInt32())
+                length = self._const(0, self._size_type)
                 return self.append(ir.Alloc([length], node.type))
             elif len(node.args) == 1 and len(node.keywords) == 0:
                 arg = self.visit(node.args[0])
                 length = self.iterable_len(arg)
                 result = self.append(ir.Alloc([length], node.type))
 
+                if builtins.is_listish(arg.type) and not builtins.is_array(arg.type) and \
+                        builtins.get_iterable_elt(arg.type) == \
+                            builtins.get_iterable_elt(node.type):
+                    # The copy is shallow, so the elements are copied bitwise
+                    # regardless of their type.
+                    zero = self._const(0, self._size_type)
+                    self.copy_list_range(result, zero, arg, zero, length)
+                    return result
+
                 def body_gen(index):
                     elt = self.iterable_get(arg, index)
                     elt = self.append(ir.Coerce(elt, builtins.get_iterable_elt(node.type)))
                     self.append(ir.SetElem(result, index, elt))
-                    return self.append(ir.Arith(ast.Add(loc=None), index,
-                                                ir.Constant(1, length.type)))
-                self._make_loop(ir.Constant(0, length.type),
-                    lambda index: self.append(ir.Compare(ast.Lt(loc=None), index, length)),
-                    body_gen)
+                self._make_counted_loop(length, body_gen)
 
                 return result
             else:
@@ -2327,7 +2616,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
                         first_elt = arg
                     else:
                         first_elt = self.iterable_get(first_elt,
-                                                      ir.Constant(0, self._size_type))
+                                                      self._const(0, self._size_type))
                     lengths.append(self.iterable_len(first_elt))
 
                 shape = self.append(ir.Alloc(lengths, result_type.attributes["shape"]))
@@ -2350,7 +2639,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
                             # by definition).
                             result_len = self.append(ir.GetAttr(shape, dim_idx))
                             self._make_check(
-                                self.append(ir.Compare(ast.Eq(loc=None), this_level_len, result_len)),
+                                self.append(ir.Compare(_EQ, this_level_len, result_len)),
                                 lambda a, b: self.alloc_exn(
                                     builtins.TException("ValueError"),
                                     ir.Constant(
@@ -2362,42 +2651,23 @@ class ARTIQIRGenerator(algorithm.Visitor):
                         def body_gen(index):
                             elem = self.iterable_get(indexed_arg, index)
                             assign_elems(outer_indices + [index], elem)
-                            return self.append(
-                                ir.Arith(ast.Add(loc=None), index,
-                                        ir.Constant(1, self._size_type)))
-                        self._make_loop(
-                            ir.Constant(0, self._size_type), lambda index: self.append(
-                                ir.Compare(ast.Lt(loc=None), index, this_level_len)), body_gen)
+                        self._make_counted_loop(this_level_len, body_gen)
                 assign_elems([], arg)
                 return self.append(ir.Alloc([buffer, shape], node.type))
             else:
                 assert False
         elif types.is_builtin(typ, "range"):
             elt_typ = builtins.get_iterable_elt(node.type)
-            if len(node.args) == 1 and len(node.keywords) == 0:
-                max_arg = self.visit(node.args[0])
-                return self.append(ir.Alloc([
-                    ir.Constant(elt_typ.zero(), elt_typ),
-                    max_arg,
-                    ir.Constant(elt_typ.one(), elt_typ),
-                ], node.type))
-            elif len(node.args) == 2 and len(node.keywords) == 0:
-                min_arg = self.visit(node.args[0])
-                max_arg = self.visit(node.args[1])
-                return self.append(ir.Alloc([
-                    min_arg,
-                    max_arg,
-                    ir.Constant(elt_typ.one(), elt_typ),
-                ], node.type))
-            elif len(node.args) == 3 and len(node.keywords) == 0:
-                min_arg = self.visit(node.args[0])
-                max_arg = self.visit(node.args[1])
-                step_arg = self.visit(node.args[2])
-                return self.append(ir.Alloc([
-                    min_arg,
-                    max_arg,
-                    step_arg,
-                ], node.type))
+            if 1 <= len(node.args) <= 3 and len(node.keywords) == 0:
+                args = [self.visit(arg_node) for arg_node in node.args]
+                if len(args) == 1:
+                    args.insert(0, self._const(elt_typ.zero(), elt_typ))
+                if len(args) == 2:
+                    args.append(self._const(elt_typ.one(), elt_typ))
+                # When all of the bounds are constants, iterable_len, iterable_get
+                # and visit_ForT read them off this instruction instead of loading
+                # them at runtime; see _constant_range_bounds.
+                return self.append(ir.Alloc(args, node.type))
             else:
                 assert False
         elif types.is_builtin(typ, "len"):
@@ -2416,23 +2686,23 @@ class ARTIQIRGenerator(algorithm.Visitor):
             if len(node.args) == 1 and len(node.keywords) == 0:
                 arg = self.visit(node.args[0])
                 neg = self.append(
-                    ir.Arith(ast.Sub(loc=None), ir.Constant(0, arg.type), arg))
+                    ir.Arith(_SUB, self._const(0, arg.type), arg))
                 cond = self.append(
-                    ir.Compare(ast.Lt(loc=None), arg, ir.Constant(0, arg.type)))
+                    ir.Compare(_LT, arg, self._const(0, arg.type)))
                 return self.append(ir.Select(cond, neg, arg))
             else:
                 assert False
         elif types.is_builtin(typ, "min"):
             if len(node.args) == 2 and len(node.keywords) == 0:
                 arg0, arg1 = map(self.visit, node.args)
-                cond = self.append(ir.Compare(ast.Lt(loc=None), arg0, arg1))
+                cond = self.append(ir.Compare(_LT, arg0, arg1))
                 return self.append(ir.Select(cond, arg0, arg1))
             else:
                 assert False
         elif types.is_builtin(typ, "max"):
             if len(node.args) == 2 and len(node.keywords) == 0:
                 arg0, arg1 = map(self.visit, node.args)
-                cond = self.append(ir.Compare(ast.Gt(loc=None), arg0, arg1))
+                cond = self.append(ir.Compare(_GT, arg0, arg1))
                 return self.append(ir.Select(cond, arg0, arg1))
             else:
                 assert False
@@ -2442,7 +2712,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
                 num_dims = node.type.find()["num_dims"].value
                 if types.is_tuple(arg0.type):
-                    lens = [self.append(ir.GetAttr(arg0, i)) for i in range(num_dims)]
+                    lens = self.extend([ir.GetAttr(arg0, i) for i in range(num_dims)])
                 else:
                     assert num_dims == 1
                     lens = [arg0]
@@ -2453,13 +2723,8 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
                 def body_gen(index):
                     self.append(ir.SetElem(result, index, arg1))
-                    return self.append(
-                        ir.Arith(ast.Add(loc=None), index,
-                                 ir.Constant(1, self._size_type)))
 
-                self._make_loop(
-                    ir.Constant(0, self._size_type), lambda index: self.append(
-                        ir.Compare(ast.Lt(loc=None), index, total_len)), body_gen)
+                self._make_counted_loop(total_len, body_gen)
                 return result
             else:
                 assert False
@@ -2482,29 +2747,19 @@ class ARTIQIRGenerator(algorithm.Visitor):
 
                 def outer_gen(idx1):
                     arg_base = self.append(ir.Offset(arg_buffer, idx1))
-                    result_offset = self.append(ir.Arith(ast.Mult(loc=None), idx1,
+                    result_offset = self.append(ir.Arith(_MULT, idx1,
                                                          dim0))
                     result_base = self.append(ir.Offset(result_buffer, result_offset))
 
                     def inner_gen(idx0):
                         arg_offset = self.append(
-                            ir.Arith(ast.Mult(loc=None), idx0, dim1))
+                            ir.Arith(_MULT, idx0, dim1))
                         val = self.append(ir.GetElem(arg_base, arg_offset))
                         self.append(ir.SetElem(result_base, idx0, val))
-                        return self.append(
-                            ir.Arith(ast.Add(loc=None), idx0, ir.Constant(1,
-                                                                          idx0.type)))
-
-                    self._make_loop(
-                        ir.Constant(0, self._size_type), lambda idx0: self.append(
-                            ir.Compare(ast.Lt(loc=None), idx0, dim0)), inner_gen)
-                    return self.append(
-                        ir.Arith(ast.Add(loc=None), idx1, ir.Constant(1, idx1.type)))
-
-                self._make_loop(
-                    ir.Constant(0, self._size_type),
-                    lambda idx1: self.append(ir.Compare(ast.Lt(loc=None), idx1, dim1)),
-                    outer_gen)
+
+                    self._make_counted_loop(dim0, inner_gen)
+
+                self._make_counted_loop(dim1, outer_gen)
                 return result
             else:
                 assert False
@@ -2522,7 +2777,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
         elif types.is_builtin(typ, "delay"):
             if len(node.args) == 1 and len(node.keywords) == 0:
                 arg = self.visit(node.args[0])
-                arg_mu_float = self.append(ir.Arith(ast.Div(loc=None), arg, self.ref_period))
+                arg_mu_float = self.append(ir.Arith(_DIV, arg, self.ref_period))
                 arg_mu = self.append(ir.Builtin("round", [arg_mu_float], builtins.TInt64()))
                 return self.append(ir.Builtin("delay_mu", [arg_mu], builtins.TNone()))
             else:
@@ -2537,7 +2792,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 timeout = self.visit(node.args[1])
             elif len(node.args) == 1 and len(node.keywords) == 0:
                 fn = node.args[0].type
-                timeout = ir.Constant(-1, builtins.TInt64())
+                timeout = self._const(-1, builtins.TInt64())
             else:
                 assert False
             if types.is_method(fn):
@@ -2579,7 +2834,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
             if len(node.args) == 2 and len(node.keywords) == 0:
                 name = node.args[0].s
                 vartype = node.args[1].value
-                timeout = ir.Constant(-1, builtins.TInt64())
+                timeout = self._const(-1, builtins.TInt64())
             elif len(node.args) == 3 and len(node.keywords) == 0:
                 name = node.args[0].s
                 vartype = node.args[1].value
@@ -2676,26 +2931,22 @@ class ARTIQIRGenerator(algorithm.Visitor):
                 else:
                     args[index + offset] = self.append(ir.Alloc([arg], ir.TOption(arg.type)))
 
-            for keyword in keywords:
-                arg = keywords[keyword]
-                if keyword in fn_typ.args:
-                    for index, arg_name in enumerate(fn_typ.args):
-                        if keyword == arg_name:
-                            assert args[index] is None
-                            args[index] = arg
-                            break
-                elif keyword in fn_typ.optargs:
-                    for index, optarg_name in enumerate(fn_typ.optargs):
-                        if keyword == optarg_name:
-                            assert args[len(fn_typ.args) + index] is None
-                            args[len(fn_typ.args) + index] = \
-                                    self.append(ir.Alloc([arg], ir.TOption(arg.type)))
-                            break
-
-            for index, optarg_name in enumerate(fn_typ.optargs):
-                if args[len(fn_typ.args) + index] is None:
-                    args[len(fn_typ.args) + index] = \
-                            self.append(ir.Alloc([], ir.TOption(fn_typ.optargs[optarg_name])))
+            if keywords:
+                arg_indices = {arg_name: index for index, arg_name in
+                               enumerate(chain(fn_typ.args, fn_typ.optargs))}
+                for keyword, arg in keywords.items():
+                    index = arg_indices.get(keyword)
+                    if index is None:
+                        continue
+                    assert args[index] is None
+                    if index < len(fn_typ.args):
+                        args[index] = arg
+                    else:
+                        args[index] = self.append(ir.Alloc([arg], ir.TOption(arg.type)))
+
+            for index, optarg_type in enumerate(fn_typ.optargs.values(), len(fn_typ.args)):
+                if args[index] is None:
+                    args[index] = self.append(ir.Alloc([], ir.TOption(optarg_type)))
 
             if self_arg is not None:
                 assert args[0] is None
@@ -2910,11 +3161,11 @@ class ARTIQIRGenerator(algorithm.Visitor):
                     assert False
 
                 length = self.iterable_len(value)
-                last = self.append(ir.Arith(ast.Sub(loc=None), length, ir.Constant(1, length.type)))
+                last = self.append(ir.Arith(_SUB, length, self._const(1, length.type)))
                 def body_gen(index):
                     elt = self.iterable_get(value, index)
                     self.polymorphic_print([elt], separator="", as_repr=True, as_rtio=as_rtio)
-                    is_last = self.append(ir.Compare(ast.Lt(loc=None), index, last))
+                    is_last = self.append(ir.Compare(_LT, index, last))
                     head = self.current_block
 
                     if_last = self.current_block = self.add_block("print.comma")
@@ -2924,11 +3175,7 @@ class ARTIQIRGenerator(algorithm.Visitor):
                     if_last.append(ir.Branch(tail))
                     head.append(ir.BranchIf(is_last, if_last, tail))
 
-                    return self.append(ir.Arith(ast.Add(loc=None), index,
-                                                ir.Constant(1, length.type)))
-                self._make_loop(ir.Constant(0, length.type),
-                    lambda index: self.append(ir.Compare(ast.Lt(loc=None), index, length)),
-                    body_gen)
+                self._make_counted_loop(length, body_gen)
 
                 if builtins.is_list(value.type):
                     format_string += "]"
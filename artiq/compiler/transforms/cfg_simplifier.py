@@ -0,0 +1,154 @@
+"""
+:class:`CFGSimplifier` is a constant folding and control flow
+simplification transform: it evaluates arithmetic, comparisons and
+selects with constant operands, turns conditional branches on
+constant conditions into unconditional ones, and merges basic blocks
+into their only predecessor when it branches to them unconditionally.
+
+Blocks that become unreachable are left to :class:`DeadCodeEliminator`.
+"""
+
+import operator
+from pythonparser import ast
+from .. import ir, builtins
+
+_ARITH_OPS = {
+    ast.Add:    operator.add,
+    ast.Sub:    operator.sub,
+    ast.Mult:   operator.mul,
+    ast.BitAnd: operator.and_,
+    ast.BitOr:  operator.or_,
+    ast.BitXor: operator.xor,
+}
+
+# Floating-point results are rounded the same way as in the backend only
+# for these operations.
+_FLOAT_ARITH_OPS = (ast.Add, ast.Sub, ast.Mult)
+
+# Logical operations on i1 are expressed as these bitwise operations.
+_BOOL_ARITH_OPS = (ast.BitAnd, ast.BitOr, ast.BitXor)
+
+_COMPARE_OPS = {
+    ast.Eq:    operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt:    operator.lt,
+    ast.LtE:   operator.le,
+    ast.Gt:    operator.gt,
+    ast.GtE:   operator.ge,
+}
+
+def _is_foldable(value):
+    if not isinstance(value, ir.Constant):
+        return False
+    elif builtins.is_bool(value.type):
+        return isinstance(value.value, bool)
+    elif builtins.is_int(value.type):
+        return isinstance(value.value, int) and not isinstance(value.value, bool)
+    elif builtins.is_float(value.type):
+        # NaN compares differently depending on the predicate used by the backend.
+        return isinstance(value.value, float) and value.value == value.value
+    else:
+        return False
+
+def _fits(value, typ):
+    width = builtins.get_int_width(typ)
+    return -(1 << (width - 1)) <= value < (1 << (width - 1))
+
+class CFGSimplifier:
+    def process(self, functions):
+        for func in functions:
+            self.process_function(func)
+
+    def process_function(self, func):
+        modified = True
+        while modified:
+            modified = False
+            for insn in list(func.instructions()):
+                value = self.fold(insn)
+                if value is not None:
+                    insn.replace_all_uses_with(value)
+                    insn.erase()
+                    modified = True
+
+        for block in func.basic_blocks:
+            if block.is_terminated():
+                self.fold_branch(block)
+
+        for block in list(func.basic_blocks):
+            if block.function is not None:
+                while self.merge_successor(func, block):
+                    pass
+
+    def fold(self, insn):
+        if isinstance(insn, ir.Select):
+            cond = insn.condition()
+            if _is_foldable(cond):
+                return insn.if_true() if cond.value else insn.if_false()
+        elif isinstance(insn, ir.Compare):
+            lhs, rhs = insn.lhs(), insn.rhs()
+            if type(insn.op) in _COMPARE_OPS and _is_foldable(lhs) and _is_foldable(rhs):
+                result = _COMPARE_OPS[type(insn.op)](lhs.value, rhs.value)
+                return ir.Constant(result, insn.type)
+        elif isinstance(insn, ir.Arith):
+            lhs, rhs = insn.lhs(), insn.rhs()
+            if type(insn.op) in _ARITH_OPS and _is_foldable(lhs) and _is_foldable(rhs):
+                if builtins.is_int(insn.type):
+                    result = _ARITH_OPS[type(insn.op)](lhs.value, rhs.value)
+                    # Leave wraparound to the backend.
+                    if _fits(result, insn.type):
+                        return ir.Constant(result, insn.type)
+                elif builtins.is_float(insn.type) and isinstance(insn.op, _FLOAT_ARITH_OPS):
+                    result = _ARITH_OPS[type(insn.op)](lhs.value, rhs.value)
+                    return ir.Constant(result, insn.type)
+                elif builtins.is_bool(insn.type) and isinstance(insn.op, _BOOL_ARITH_OPS):
+                    result = _ARITH_OPS[type(insn.op)](lhs.value, rhs.value)
+                    return ir.Constant(result, insn.type)
+
+    def fold_branch(self, block):
+        terminator = block.terminator()
+        if not isinstance(terminator, ir.BranchIf) or \
+                not _is_foldable(terminator.condition()):
+            return
+
+        if terminator.condition().value:
+            target, other = terminator.if_true(), terminator.if_false()
+        else:
+            target, other = terminator.if_false(), terminator.if_true()
+
+        # When both edges lead to the same block, it keeps this one as
+        # a predecessor, and its phis must keep their incoming values.
+        if other is not target:
+            for insn in other.instructions_of(ir.Phi):
+                insn.remove_incoming_block(block)
+
+        branch = ir.Branch(target)
+        branch.loc = terminator.loc
+        terminator.replace_with(branch)
+
+    def merge_successor(self, func, block):
+        terminator = block.terminator() if block.is_terminated() else None
+        if type(terminator) is not ir.Branch:
+            return False
+
+        successor = terminator.target()
+        if successor is block or successor is func.entry():
+            return False
+
+        # The only way into the successor must be this branch; besides that,
+        # it may only be referenced as an incoming block of phis further down.
+        for use in successor.uses:
+            if use is not terminator and \
+                    not (isinstance(use, ir.Phi) and use.basic_block is not successor):
+                return False
+
+        for insn in successor.instructions_of(ir.Phi):
+            insn.replace_all_uses_with(insn.incoming_value_for_block(block))
+            insn.erase()
+
+        terminator.erase()
+        for insn in list(successor.instructions):
+            successor.remove(insn)
+            block.append(insn)
+        successor.replace_all_uses_with(block)
+        successor.erase()
+        return True
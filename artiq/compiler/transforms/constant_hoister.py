@@ -13,7 +13,7 @@ class ConstantHoister:
 
     def process_function(self, func):
         entry = func.entry()
-        worklist = set(func.instructions())
+        worklist = set(func.instructions_of(ir.GetAttr))
         moved = set()
         while len(worklist) > 0:
             insn = worklist.pop()
@@ -27,7 +27,7 @@ class ConstantHoister:
                     if isinstance(operand, ir.Argument):
                         pass
                     elif isinstance(operand, ir.Instruction) and operand.basic_block == entry:
-                        index_in_entry = entry.index(operand) + 1
+                        index_in_entry = max(index_in_entry, entry.index(operand) + 1)
                     else:
                         has_variant_operands = True
                         break
@@ -36,7 +36,7 @@ class ConstantHoister:
                     continue
 
                 insn.remove_from_parent()
-                entry.instructions.insert(index_in_entry, insn)
+                entry.insert(insn, before=entry.instructions[index_in_entry])
                 moved.add(insn)
 
                 for use in insn.uses:
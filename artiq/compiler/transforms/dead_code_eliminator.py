@@ -39,16 +39,15 @@ class DeadCodeEliminator:
         modified = True
         while modified:
             modified = False
-            for insn in func.instructions():
-                # Note that GetLocal is treated as an impure operation:
-                # the local access validator has to observe it to emit
-                # a diagnostic for reads of uninitialized locals, and
-                # it also has to run after the interleaver, but interleaver
-                # doesn't like to work with IR before DCE.
-                if isinstance(insn, (ir.Phi, ir.Alloc, ir.GetAttr, ir.GetElem, ir.Coerce,
-                                     ir.Arith, ir.Compare, ir.Select, ir.Quote, ir.Closure,
-                                     ir.Offset)) \
-                        and not any(insn.uses):
+            # Note that GetLocal is treated as an impure operation:
+            # the local access validator has to observe it to emit
+            # a diagnostic for reads of uninitialized locals, and
+            # it also has to run after the interleaver, but interleaver
+            # doesn't like to work with IR before DCE.
+            for insn in list(func.instructions_of(ir.Phi, ir.Alloc, ir.GetAttr, ir.GetElem,
+                                                  ir.Coerce, ir.Arith, ir.Compare, ir.Select,
+                                                  ir.Quote, ir.Closure, ir.Offset)):
+                if not any(insn.uses):
                     insn.erase()
                     modified = True
 
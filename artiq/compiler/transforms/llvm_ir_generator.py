@@ -391,6 +391,8 @@ class LLVMIRGenerator:
             llty = ll.FunctionType(llvoid, [])
         elif name == "memcmp":
             llty = ll.FunctionType(lli32, [llptr, llptr, lli32])
+        elif name == "llvm.memcpy.p0i8.p0i8.i32":
+            llty = ll.FunctionType(llvoid, [llptr, llptr, lli32, lli1])
         elif name == "rpc_send":
             llty = ll.FunctionType(llvoid, [lli32, llsliceptr, llptrptr])
         elif name == "rpc_send_async":
@@ -780,6 +782,17 @@ class LLVMIRGenerator:
     def llindex(self, index):
         return ll.Constant(lli32, index)
 
+    def llptr_to_elt(self, collection, llindex):
+        llelts = self.map(collection)
+        if builtins.is_list(collection.type):
+            llelts = self.llbuilder.load(self.llbuilder.gep(llelts,
+                                                            [self.llindex(0),
+                                                             self.llindex(0)],
+                                                            inbounds=True))
+        else:
+            llelts = self.llbuilder.extract_value(llelts, 0)
+        return self.llbuilder.gep(llelts, [llindex], inbounds=True)
+
     def process_Alloc(self, insn):
         if ir.is_environment(insn.type):
             return self.llbuilder.alloca(self.llty_of_type(insn.type, bare=True),
@@ -804,6 +817,20 @@ class LLVMIRGenerator:
             if types._is_pointer(insn.type):
                 return llalloc
             if builtins.is_list(insn.type):
+                elts = insn.operands[1:]
+                if elts and all(isinstance(elt, ir.Constant) for elt in elts):
+                    # Initialize the whole buffer with one aggregate store, which
+                    # LLVM lowers to a copy from read-only data.
+                    llarrayty = ll.ArrayType(lleltty, len(elts))
+                    llarrayptr = self.llbuilder.bitcast(llalloc, llarrayty.as_pointer())
+                    self.llbuilder.store(ll.Constant(llarrayty, [self.map(elt) for elt in elts]),
+                                         llarrayptr)
+                else:
+                    for index, elt in enumerate(elts):
+                        self.llbuilder.store(self.map(elt),
+                                             self.llbuilder.gep(llalloc, [self.llindex(index)],
+                                                                inbounds=True))
+
                 llvalue = self.llbuilder.alloca(self.llty_of_type(insn.type).pointee, size=1)
                 self.llbuilder.store(llalloc, self.llbuilder.gep(llvalue,
                                                                  [self.llindex(0),
@@ -1324,6 +1351,41 @@ class LLVMIRGenerator:
                                                                self.llindex(1)]))
             else:
                 return self.llbuilder.extract_value(self.map(collection), 1)
+        elif insn.op == "tuple_concat":
+            llvalue = ll.Constant(self.llty_of_type(insn.type), ll.Undefined)
+            index = 0
+            for operand in insn.operands:
+                lloperand = self.map(operand)
+                for operand_index in range(len(operand.type.find().elts)):
+                    llelt = self.llbuilder.extract_value(lloperand, operand_index)
+                    llvalue = self.llbuilder.insert_value(llvalue, llelt, index)
+                    index += 1
+            llvalue.name = insn.name
+            return llvalue
+        elif insn.op == "list_copy_range":
+            # Copies count elements from src[src_index:] into dest[dest_index:];
+            # the two buffers never overlap.
+            dest, dest_index, src, src_index, count = insn.operands
+            elt_size, _ = self.abi_layout_info.get_size_align_for_type(
+                builtins.get_iterable_elt(dest.type))
+            llsize = self.llbuilder.mul(self.map(count), ll.Constant(lli32, elt_size))
+            lldest = self.llbuilder.bitcast(
+                self.llptr_to_elt(dest, self.map(dest_index)), llptr)
+            llsrc = self.llbuilder.bitcast(
+                self.llptr_to_elt(src, self.map(src_index)), llptr)
+            return self.llbuilder.call(self.llbuiltin("llvm.memcpy.p0i8.p0i8.i32"),
+                                       [lldest, llsrc, llsize, ll.Constant(lli1, False)])
+        elif insn.op == "list_memcmp":
+            # Whether the first count elements of both collections are bitwise equal.
+            lhs, rhs, count = insn.operands
+            elt_size, _ = self.abi_layout_info.get_size_align_for_type(
+                builtins.get_iterable_elt(lhs.type))
+            llsize = self.llbuilder.mul(self.map(count), ll.Constant(lli32, elt_size))
+            lllhs = self.llbuilder.bitcast(self.llptr_to_elt(lhs, self.llindex(0)), llptr)
+            llrhs = self.llbuilder.bitcast(self.llptr_to_elt(rhs, self.llindex(0)), llptr)
+            llresult = self.llbuilder.call(self.llbuiltin("memcmp"), [lllhs, llrhs, llsize])
+            return self.llbuilder.icmp_signed('==', llresult, ll.Constant(lli32, 0),
+                                              name=insn.name)
         elif insn.op in ("printf", "rtio_log"):
             # We only get integers, floats, pointers and strings here.
             lloperands = []
@@ -0,0 +1,15 @@
+# RUN: %python -m artiq.compiler.testbench.irgen %s >%t
+# RUN: OutputCheck %s --file-to-check=%t
+
+# CHECK-L: numpy.int32 input.f(environment(...) %ARG.ENV) {
+# CHECK-NOT-L: branchif
+# CHECK-L: return numpy.int32 1
+
+def f():
+    x = 3
+    if x > 2:
+        return 1
+    else:
+        return 2
+
+f()
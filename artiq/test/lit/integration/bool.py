@@ -19,3 +19,9 @@ assert bool(0) is False and bool(1) is True
 assert bool(0.0) is False and bool(1.0) is True
 x = []; assert bool(x) is False; x = [1]; assert bool(x) is True
 assert bool(range(0)) is False and bool(range(1)) is True
+
+p, q = 0, 2
+assert (p and q) is 0 and (q and p) is 0
+assert (p or q) is 2 and (q or p) is 2
+assert (p < q and q > 1) and not (p > q or q < 1)
+assert p < q < 3 and not (p < q < 2) and not (q < p < 3)
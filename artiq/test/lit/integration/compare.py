@@ -17,3 +17,5 @@ assert x is x and x is not y
 lst = [1, 2, 3]
 assert 1 in lst and 0 not in lst
 assert 1 in range(10) and 11 not in range(10) and -1 not in range(10)
+assert 5 in range(1, 10, 4) and 3 not in range(1, 10, 4) and 9 in range(1, 10, 4)
+assert -3 in range(-7, 0, 2) and -4 not in range(-7, 0, 2)
@@ -51,3 +51,40 @@ while True:
     assert False
 else:
     assert False
+
+# Constant ranges with a start offset and custom steps. Each loop is
+# checked against the same range held in a variable, which is iterated
+# by index, and against the length of the range.
+total = 0
+count = 0
+for x in range(3, 15, 4):
+    total += x
+    count += 1
+assert total == 3 + 7 + 11
+assert count == len(range(3, 15, 4))
+
+r = range(3, 15, 4)
+total = 0
+for x in r:
+    total += x
+assert total == 3 + 7 + 11
+
+total = 0
+count = 0
+for x in range(10, -2, -3):
+    total += x
+    count += 1
+assert total == 10 + 7 + 4 + 1
+assert count == len(range(10, -2, -3))
+
+r = range(10, -2, -3)
+total = 0
+for x in r:
+    total += x
+assert total == 10 + 7 + 4 + 1
+
+for x in range(5, 5):
+    assert False
+
+for x in range(5, 0):
+    assert False
@@ -7,6 +7,9 @@ assert (x, y) == (1, 2)
 
 lst = [1, 2, 3]
 assert [x*x for x in lst] == [1, 4, 9]
+assert [x for x in lst] == [1, 2, 3]
+assert [x for x in [1.0, 2.0]] == [1.0, 2.0]
+assert [x for x in [[1], [2]]] == [[1], [2]]
 
 assert [0] == [0]
 assert [0] != [1]
@@ -14,6 +17,20 @@ assert [[0]] == [[0]]
 assert [[0]] != [[1]]
 assert [[[0]]] == [[[0]]]
 assert [[[0]]] != [[[1]]]
+assert [1, 2] != [1, 2, 3] and [1, 2, 3] != [1, 2]
+assert [1, 2, 3] == [1, 2, 3] and [1, 2, 3] != [1, 0, 3]
+assert [True, False] == [True, False] and [True] != [False]
+assert [0.0] == [-0.0]
 
 assert [1] + [2] == [1, 2]
+assert [1, 2] + [] == [1, 2]
+assert [] + [3, 4] == [3, 4]
+assert [1.0] + [2.0, 3.0] == [1.0, 2.0, 3.0]
 assert [1] * 3 == [1, 1, 1]
+assert [1, 2] * 2 == [1, 2, 1, 2]
+assert 2 * [1, 2] == [1, 2, 1, 2]
+assert [1, 2] * 0 == []
+
+assert list([1, 2, 3]) == [1, 2, 3]
+assert list([[1], [2]]) == [[1], [2]]
+assert list(range(3)) == [0, 1, 2]
@@ -11,3 +11,11 @@ assert (0,) != (1,)
 
 assert ([0],) == ([0],)
 assert ([0],) != ([1],)
+
+assert (1, 2, 3) == (1, 2, 3)
+assert (1, 2, 3) != (1, 2, 4)
+assert (0, 2, 3) != (1, 2, 3)
+assert (0, [1], 2.0) == (0, [1], 2.0)
+assert (1,) + () + (2, [3]) == (1, 2, [3])
+assert (1, 2.0, True, 4) == (1, 2.0, True, 4) and (1, 2.0, True, 4) != (1, 2.0, False, 4)
+assert (1, 2, 3, 4, 5) == (1, 2, 3, 4, 5) and (1, 2, 3, 4, 5) != (1, 2, 3, 4, 0)